@@ -0,0 +1,255 @@
+"""Benchmark RecruitCalculator and check alternative backends against calculate().
+
+Usage:
+    python -m benchmarks.calculator [--sizes 100 1000 10000] [--calls 500] [--fuzz 2000] [-o out.json]
+
+Synthetic pools are generated with the same tag layout the fetcher
+produces (class, position, affixes, plus Top Operator / Senior Operator /
+Robot / Starter by rarity), with a few operators carrying those special
+tags at other rarities so the rarity rules are actually exercised.
+
+For every pool size this reports index build time, per-call latency and
+allocations per sort_mode, then fuzzes random tag sets through every
+backend in BACKENDS and compares the results with calculate(), the
+reference. Exits non-zero on the first mismatch and prints a case that
+reproduces it.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+from src.calculator import RecruitCalculator, sort_results
+from src.config import VALID_TAGS
+from src.metrics import percentile
+
+SORT_MODES = ("min", "max")
+CLASSES = ("guard", "sniper", "defender", "medic", "supporter", "caster", "specialist", "vanguard")
+POSITIONS = ("melee", "ranged")
+SPECIAL_TAGS = {6: "top operator", 5: "senior operator", 1: "robot", 2: "starter"}
+AFFIXES = tuple(t.lower() for t in VALID_TAGS
+                if t.lower() not in CLASSES + POSITIONS and t.lower() not in SPECIAL_TAGS.values())
+# Roughly the shape of the real recruitment pool
+RARITY_WEIGHTS = {1: 3, 2: 5, 3: 30, 4: 35, 5: 20, 6: 7}
+
+def synthetic_pool(size, seed=0):
+    rng = random.Random(seed)
+    rarities = rng.choices(list(RARITY_WEIGHTS), weights=list(RARITY_WEIGHTS.values()), k=size)
+    pool = []
+    for i, rarity in enumerate(rarities):
+        tags = {rng.choice(CLASSES), rng.choice(POSITIONS)}
+        tags.update(rng.sample(AFFIXES, rng.randint(1, 3)))
+        if rarity in SPECIAL_TAGS:
+            tags.add(SPECIAL_TAGS[rarity])
+        if rng.random() < 0.03:
+            # Special tag on an unexpected rarity, so the rules aren't just tag lookups
+            tags.add(rng.choice(list(SPECIAL_TAGS.values())))
+        pool.append({"name": f"Op{i:05d}", "rarity": rarity, "tags": tags})
+    return pool
+
+def random_tags(rng):
+    """1-5 distinct tags as the scanner reports them; specials and unknowns show up often"""
+    count = rng.randint(1, 5)
+    tags = rng.sample(VALID_TAGS, count)
+    if rng.random() < 0.3:
+        special = rng.choice(["Top Operator", "Senior Operator", "Robot", "Starter"])
+        if special not in tags:
+            tags[rng.randrange(count)] = special
+    if rng.random() < 0.05:
+        tags[rng.randrange(count)] = "Unknown Tag"
+    return tags
+
+# Each backend takes (calculator, tags, sort_mode) and must return what
+# calculator.calculate(tags, sort_mode) returns.
+
+def _incremental(calculator, tags, sort_mode):
+    # The streaming scan path: one extend() per tag as OCR finds it
+    results, seen = [], []
+    for tag in tags:
+        results = calculator.extend(results, seen, tag, sort_mode)
+        if tag.lower() not in [t.lower() for t in seen]:
+            seen.append(tag)
+    return results
+
+def _edited(calculator, tags, sort_mode):
+    # The tag editor: a misread tag up front, then removed with without()
+    lowered = {t.lower() for t in tags}
+    extra = next(t for t in VALID_TAGS if t.lower() not in lowered)
+    return calculator.without(calculator.calculate([extra] + tags, sort_mode), extra)
+
+def _naive(calculator, tags, sort_mode):
+    # No index: scan the pool for every combo and apply the rarity rules as written
+    from itertools import combinations
+    tags = [t.lower() for t in tags]
+    results = []
+    for r in range(1, 4):
+        for combo in combinations(tags, r):
+            top, robot, starter = "top operator" in combo, "robot" in combo, "starter" in combo
+            ops = [op for op in calculator.pool
+                   if all(t in op['tags'] for t in combo)
+                   and not (op['rarity'] == 6 and not top)
+                   and not (op['rarity'] == 1 and not robot)
+                   and not (op['rarity'] <= 2 and not robot and not starter)]
+            if ops:
+                results.append({
+                    "tags": list(combo),
+                    "min": min(op['rarity'] for op in ops),
+                    "max": max(op['rarity'] for op in ops),
+                    "ops": sorted(ops, key=lambda x: x['rarity'], reverse=True),
+                })
+    sort_results(results, sort_mode)
+    return results
+
+BACKENDS = {
+    "incremental": _incremental,
+    "edited": _edited,
+    "naive": _naive,
+}
+
+def canonical(results):
+    # Combo order is compared exactly (it is what the overlay shows); operators
+    # of equal rarity have no defined order, so only their set is compared
+    return [(tuple(r['tags']), r['min'], r['max'],
+             tuple(sorted((-op['rarity'], op['name']) for op in r['ops'])))
+            for r in results]
+
+def rule_violations(results):
+    """Properties every result must satisfy, independent of any backend"""
+    problems = []
+    for r in results:
+        combo = set(r['tags'])
+        rarities = [op['rarity'] for op in r['ops']]
+        if not r['ops']:
+            problems.append(f"{r['tags']}: empty combo listed")
+            continue
+        if rarities != sorted(rarities, reverse=True):
+            problems.append(f"{r['tags']}: operators not sorted by rarity")
+        if (r['min'], r['max']) != (min(rarities), max(rarities)):
+            problems.append(f"{r['tags']}: min/max don't match operators")
+        for op in r['ops']:
+            if not combo <= set(op['tags']):
+                problems.append(f"{r['tags']}: {op['name']} lacks a combo tag")
+            if op['rarity'] == 6 and "top operator" not in combo:
+                problems.append(f"{r['tags']}: 6* {op['name']} without Top Operator")
+            if op['rarity'] == 1 and "robot" not in combo:
+                problems.append(f"{r['tags']}: 1* {op['name']} without Robot")
+            if op['rarity'] <= 2 and not combo & {"robot", "starter"}:
+                problems.append(f"{r['tags']}: {op['rarity']}* {op['name']} without Robot or Starter")
+    return problems
+
+def summarize(samples):
+    return {
+        "p50": round(percentile(samples, 50), 4),
+        "p95": round(percentile(samples, 95), 4),
+        "max": round(max(samples), 4),
+    }
+
+def measure(pool, tag_sets, builds=5):
+    build_ms = []
+    for _ in range(builds):
+        start = time.perf_counter()
+        calculator = RecruitCalculator(pool)
+        build_ms.append((time.perf_counter() - start) * 1000)
+
+    modes = {}
+    for sort_mode in SORT_MODES:
+        latency = []
+        for tags in tag_sets:
+            start = time.perf_counter()
+            calculator.calculate(tags, sort_mode)
+            latency.append((time.perf_counter() - start) * 1000)
+
+        # Separate pass: tracemalloc slows every allocation down
+        peaks, retained = [], []
+        tracemalloc.start()
+        for tags in tag_sets:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            results = calculator.calculate(tags, sort_mode)
+            current, peak = tracemalloc.get_traced_memory()
+            peaks.append((peak - before) / 1024)
+            retained.append((current - before) / 1024)
+            del results
+        tracemalloc.stop()
+
+        modes[sort_mode] = {
+            "latency_ms": summarize(latency),
+            "peak_alloc_kb": summarize(peaks),
+            "result_kb": summarize(retained),
+        }
+    return {"build_ms": summarize(build_ms), "modes": modes}
+
+def fuzz(pool, trials, seed):
+    """Returns (checks, first failure or None)"""
+    rng = random.Random(seed)
+    calculator = RecruitCalculator(pool)
+    checks = 0
+    for trial in range(trials):
+        tags = random_tags(rng)
+        for sort_mode in SORT_MODES:
+            reference = calculator.calculate(tags, sort_mode)
+            problems = rule_violations(reference)
+            if problems:
+                return checks, {"backend": "calculate", "tags": tags, "sort_mode": sort_mode,
+                                "trial": trial, "problem": problems[0]}
+            expected = canonical(reference)
+            for name, backend in BACKENDS.items():
+                checks += 1
+                got = canonical(backend(calculator, tags, sort_mode))
+                if got != expected:
+                    diff = next((i for i, (a, b) in enumerate(zip(got, expected)) if a != b),
+                                min(len(got), len(expected)))
+                    return checks, {"backend": name, "tags": tags, "sort_mode": sort_mode, "trial": trial,
+                                    "problem": f"differs at result {diff} "
+                                               f"({len(got)} results vs {len(expected)} expected)"}
+    return checks, None
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", type=int, default=[100, 1000, 10000], help="Pool sizes")
+    parser.add_argument("--calls", type=int, default=500, help="Timed calls per pool size and sort mode")
+    parser.add_argument("--fuzz", type=int, default=2000, help="Random tag sets checked per pool size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="Also write the report as JSON")
+    args = parser.parse_args()
+
+    report = {"seed": args.seed, "backends": ["calculate"] + list(BACKENDS), "sizes": {}}
+    failed = None
+    print(f"{'Pool':>7}{'build ms':>10}{'mode':>6}{'p50 ms':>9}{'p95 ms':>9}{'peak KB':>9}{'fuzz':>8}")
+    for size in args.sizes:
+        pool = synthetic_pool(size, args.seed)
+        rng = random.Random(args.seed + size)
+        tag_sets = [random_tags(rng) for _ in range(args.calls)]
+
+        row = measure(pool, tag_sets)
+        # The naive backend is O(pool) per combo; keep big pools affordable
+        trials = args.fuzz if size <= 1000 else max(1, args.fuzz // 10)
+        checks, failure = fuzz(pool, trials, args.seed + size)
+        row["fuzz"] = {"trials": trials, "checks": checks, "failure": failure}
+        report["sizes"][size] = row
+
+        for i, sort_mode in enumerate(SORT_MODES):
+            mode = row["modes"][sort_mode]
+            build = f"{row['build_ms']['p50']:>10.2f}" if i == 0 else " " * 10
+            status = ("FAIL" if failure else "ok") if i == 0 else ""
+            print(f"{size if i == 0 else '':>7}{build}{sort_mode:>6}{mode['latency_ms']['p50']:>9.3f}"
+                  f"{mode['latency_ms']['p95']:>9.3f}{mode['peak_alloc_kb']['p50']:>9.1f}{status:>8}")
+        if failure and failed is None:
+            failed = (size, failure)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"\nReport written to {args.output}")
+
+    if failed:
+        size, failure = failed
+        print(f"\nMISMATCH: backend {failure['backend']} on pool size {size} (seed {args.seed}), "
+              f"tags {failure['tags']}, sort {failure['sort_mode']}: {failure['problem']}")
+        sys.exit(1)
+    print(f"\nAll backends match calculate() ({', '.join(BACKENDS)})")
+
+if __name__ == "__main__":
+    main()
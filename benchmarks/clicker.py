@@ -0,0 +1,157 @@
+"""Check ClickExecutor against a fake screen and mouse.
+
+Usage:
+    python -m benchmarks.clicker [--delay-ms 40]
+
+FakeScreen draws tag boxes the way the recruitment screen does: dark when
+unselected, lighter when selected, a little lighter still under the cursor
+(after a short delay, like the game's hover fade). Clicks toggle a tag
+after `--delay-ms`; they are dropped once for a tag marked missed, never
+land on an unresponsive one, and make a covered one repaint with something
+neither lighter nor darker. Each scenario runs the executor against it and
+checks which tags end up selected, how many clicks were sent and what
+click_all() reported. Exits non-zero if any scenario doesn't behave.
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from src.clicker import ClickExecutor
+
+UNSELECTED, SELECTED, HOVER = 60, 200, 25
+
+class FakeScreen:
+    """Stands in for ScreenBackend: move/click/grab over a numpy screen"""
+
+    def __init__(self, boxes, delay=0.04, hover_delay=0.005):
+        self.boxes = boxes
+        self.delay = delay
+        self.hover_delay = hover_delay
+        self.selected = {i: False for i in range(len(boxes))}
+        self.unresponsive = set()
+        self.delays = {}
+        self.missed = set()
+        self.covered = None
+        self._cover_shown = False
+        self.clicks = {i: 0 for i in range(len(boxes))}
+        self._pending = []
+        self._cursor = None
+        self._hovered_at = 0.0
+
+    def _box_at(self, x, y):
+        return next((i for i, (x1, y1, x2, y2) in enumerate(self.boxes)
+                     if x1 <= x < x2 and y1 <= y < y2), None)
+
+    def move(self, x, y):
+        self._cursor = (x, y)
+        self._hovered_at = time.perf_counter()
+
+    def click(self, x, y):
+        i = self._box_at(x, y)
+        if i is None:
+            return
+        self.clicks[i] += 1
+        if i in self.missed:
+            self.missed.discard(i)
+        elif i == self.covered:
+            self._pending.append((time.perf_counter() + self.delay, None))
+        elif i not in self.unresponsive:
+            self._pending.append((time.perf_counter() + self.delays.get(i, self.delay), i))
+
+    def grab(self, bbox):
+        now = time.perf_counter()
+        for due, i in [p for p in self._pending if p[0] <= now]:
+            if i is None:
+                self._cover_shown = True
+            else:
+                self.selected[i] = not self.selected[i]
+            self._pending.remove((due, i))
+
+        x1, y1, x2, y2 = bbox
+        pixels = np.zeros((y2 - y1, x2 - x1, 3), dtype=np.uint8)
+        i = self._box_at(x1, y1)
+        if i is not None:
+            level = SELECTED if self.selected[i] else UNSELECTED
+            if self._cursor and self._box_at(*self._cursor) == i and now - self._hovered_at >= self.hover_delay:
+                level += HOVER
+            pixels[:] = level
+            # Text, so the box isn't flat
+            pixels[::3, ::4] = 255 - level
+        if self._cover_shown and i == self.covered:
+            # Clicking it brought up something else: drawn over the tag, no
+            # lighter or darker on average
+            pixels[:] = np.roll(pixels, 1, axis=1)
+        return pixels
+
+def tag_boxes(count):
+    return [(100 + i * 160, 400, 240 + i * 160, 440) for i in range(count)]
+
+def scenario(name, executor_args=None, count=3, **setup):
+    screen = FakeScreen(tag_boxes(count), delay=setup.pop("delay"))
+    for i in setup.get("already", ()):
+        screen.selected[i] = True
+    screen.unresponsive = set(setup.get("unresponsive", ()))
+    screen.delays = setup.get("delays", {})
+    screen.missed = set(setup.get("missed", ()))
+    screen.covered = setup.get("covered")
+    executor = ClickExecutor(screen, **(executor_args or {}))
+    targets = [(f"Tag{i}", bbox) for i, bbox in enumerate(screen.boxes)]
+    result = executor.click_all(targets)
+    # Let any click still in flight land before judging the screen
+    time.sleep(max([screen.delay] + list(screen.delays.values())) + 0.05)
+    screen.grab(screen.boxes[0])
+    return name, screen, result
+
+def check(name, screen, result, selected, clicks, failed=None):
+    problems = []
+    got = [i for i, on in screen.selected.items() if on]
+    if got != selected:
+        problems.append(f"selected {got}, expected {selected}")
+    got_clicks = [screen.clicks[i] for i in sorted(screen.clicks)]
+    if got_clicks != clicks:
+        problems.append(f"clicks {got_clicks}, expected {clicks}")
+    if result["failed"] != failed:
+        problems.append(f"reported failed={result['failed']!r}, expected {failed!r}")
+    if result["error"]:
+        problems.append(result["error"])
+    status = "FAIL" if problems else "ok"
+    print(f"{name:<28}{result['ms']:>9.0f} ms  {status}")
+    for problem in problems:
+        print(f"    {problem}")
+    return not problems
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--delay-ms", type=float, default=40, help="How long the fake game takes to react")
+    args = parser.parse_args()
+    delay = args.delay_ms / 1000
+    fast = {"timeout": 0.2}
+
+    runs = [
+        (scenario("all respond", delay=delay), {"selected": [0, 1, 2], "clicks": [1, 1, 1]}),
+        # Slower than the poll interval but inside the timeout: one click
+        (scenario("slow reaction", fast, delay=delay, delays={1: 0.15}),
+         {"selected": [0, 1, 2], "clicks": [1, 1, 1]}),
+        # First click lost: the retry sees the tag unchanged and clicks again
+        (scenario("missed click", fast, delay=delay, missed=[1]),
+         {"selected": [0, 1, 2], "clicks": [1, 2, 1]}),
+        # Already on: the first click turns it off, the executor turns it back on
+        (scenario("already selected", delay=delay, already=[1]),
+         {"selected": [0, 1, 2], "clicks": [1, 2, 1]}),
+        (scenario("unresponsive tag", fast, delay=delay, unresponsive=[1]),
+         {"selected": [0], "clicks": [1, 2, 0], "failed": "Tag1"}),
+        # Changes, but not to the selected look: stop without retrying
+        (scenario("covered tag", fast, delay=delay, covered=1),
+         {"selected": [0], "clicks": [1, 1, 0], "failed": "Tag1"}),
+    ]
+
+    print(f"{'Scenario':<28}{'time':>12}")
+    ok = all([check(name, screen, result, **expected) for (name, screen, result), expected in runs])
+    if not ok:
+        sys.exit(1)
+    print("\nAll scenarios behave")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Labelled screenshot corpus helpers shared by the benchmark scripts.
+
+A corpus is a directory of screenshots plus a ``labels.json`` mapping each
+file name to the tags visible on that screen::
+
+    {
+        "recruit_001.png": ["Guard", "Melee", "DPS", "Survival", "Starter"],
+        "recruit_002.png": ["Top Operator", "Caster", "Ranged", "AoE", "Nuker"]
+    }
+"""
+import json
+from pathlib import Path
+
+import cv2
+
+from src.config import VALID_TAGS
+
+LABELS_FILE = "labels.json"
+
+_CANONICAL = {t.lower(): t for t in VALID_TAGS}
+
+def load_corpus(directory):
+    """Return a list of (path, set_of_tags) pairs, skipping unreadable labels"""
+    directory = Path(directory)
+    labels_path = directory / LABELS_FILE
+    if not labels_path.exists():
+        raise FileNotFoundError(f"No {LABELS_FILE} in {directory}")
+
+    with open(labels_path, 'r', encoding='utf-8') as f:
+        labels = json.load(f)
+
+    corpus = []
+    for name, tags in sorted(labels.items()):
+        path = directory / name
+        if not path.exists():
+            print(f"Warning: {name} listed in {LABELS_FILE} but missing")
+            continue
+        unknown = [t for t in tags if t.lower() not in _CANONICAL]
+        if unknown:
+            print(f"Warning: {name} has unknown tags {unknown}")
+        corpus.append((path, {_CANONICAL[t.lower()] for t in tags if t.lower() in _CANONICAL}))
+    return corpus
+
+def load_image(path):
+    img = cv2.imread(str(path), cv2.IMREAD_COLOR)
+    if img is None:
+        raise ValueError(f"Could not read image {path}")
+    return img
+
+def tag_scores(predicted, expected):
+    """Return (true_positives, false_positives, false_negatives)"""
+    predicted = set(predicted)
+    tp = len(predicted & expected)
+    return tp, len(predicted - expected), len(expected - predicted)
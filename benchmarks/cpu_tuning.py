@@ -0,0 +1,96 @@
+"""Compare CPU inference settings on a labelled screenshot corpus.
+
+Usage:
+    python -m benchmarks.cpu_tuning path/to/corpus [--engine easyocr] [--threads 0 1 2 4] [-o out.json]
+
+Every combination of thread count, int8 quantization and small-input mode
+runs in its own fresh process (thread pools and quantized weights are
+process-wide), reporting wall latency, CPU time per scan, the average
+number of cores kept busy and tag precision/recall.
+"""
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from src.engines import ENGINES, DEFAULT_ENGINE
+from src.metrics import percentile
+from .corpus import load_corpus, load_image, tag_scores
+
+def run_config(corpus_dir, engine, options, profile):
+    # Imported here so each spawned worker pays for its own model load
+    from src.scanner import ScreenScanner
+
+    corpus = load_corpus(corpus_dir)
+    images = [load_image(path) for path, _ in corpus]
+    scanner = ScreenScanner(profile=profile, engine=engine, engine_options=options)
+    scanner.scan_cache.max_entries = 0  # measure OCR, not the repeat-scan cache
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        scanner.scan_for_tags(images[0])
+
+    wall, cpu = [], []
+    tp_total = fp_total = fn_total = 0
+    for (_, expected), img in zip(corpus, images):
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        with contextlib.redirect_stdout(io.StringIO()):
+            found, _ = scanner.scan_for_tags(img)
+        cpu.append((time.process_time() - cpu_start) * 1000)
+        wall.append((time.perf_counter() - wall_start) * 1000)
+
+        tp, fp, fn = tag_scores(found.keys(), expected)
+        tp_total += tp
+        fp_total += fp
+        fn_total += fn
+
+    return {
+        "engine": scanner.engine.describe(),
+        "options": options,
+        "wall_p50_ms": round(percentile(wall, 50), 2),
+        "wall_p95_ms": round(percentile(wall, 95), 2),
+        "cpu_ms_per_scan": round(sum(cpu) / len(cpu), 2),
+        "cores_busy": round(sum(cpu) / sum(wall), 2) if sum(wall) else 0.0,
+        "precision": round(tp_total / (tp_total + fp_total), 4) if tp_total + fp_total else 1.0,
+        "recall": round(tp_total / (tp_total + fn_total), 4) if tp_total + fn_total else 1.0,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus", help="Directory with screenshots and labels.json")
+    parser.add_argument("--engine", default=DEFAULT_ENGINE, choices=list(ENGINES))
+    parser.add_argument("--profile", default="baseline")
+    parser.add_argument("--threads", nargs="+", type=int, default=[0, 1, 2, 4],
+                        help="Thread counts to try (0 = library default)")
+    parser.add_argument("-o", "--output", help="Also write the rows as JSON")
+    args = parser.parse_args()
+
+    if not load_corpus(args.corpus):
+        print("Corpus is empty")
+        return
+
+    ctx = multiprocessing.get_context("spawn")
+    rows = []
+    for threads, quantize, small_input in itertools.product(args.threads, (False, True), (False, True)):
+        options = {"threads": threads, "quantize": quantize, "small_input": small_input}
+        print(f"Running {options}...")
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+            rows.append(pool.submit(run_config, args.corpus, args.engine, options, args.profile).result())
+
+    print(f"\n{'Engine':<40}{'p50 ms':>9}{'p95 ms':>9}{'CPU ms':>9}{'cores':>7}{'prec':>8}{'recall':>8}")
+    for row in rows:
+        print(f"{row['engine']:<40}{row['wall_p50_ms']:>9.1f}{row['wall_p95_ms']:>9.1f}"
+              f"{row['cpu_ms_per_scan']:>9.1f}{row['cores_busy']:>7.2f}"
+              f"{row['precision']:>8.1%}{row['recall']:>8.1%}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, indent=2, sort_keys=True)
+        print(f"\nRows written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Compare highlight latency and window churn: recreated windows vs the pool.
+
+Usage:
+    python -m benchmarks.highlights [--tags 3] [--rounds 50]
+
+Each round highlights `--tags` tag boxes and clears them again, once the
+old way (four new Toplevels per tag, destroyed on clear) and once through
+HighlightPool. Reports per-round latency percentiles and how many windows
+each approach created. Needs a display.
+"""
+import argparse
+import time
+import tkinter as tk
+
+from src.highlights import HighlightPool, border_rects, make_click_through
+from src.metrics import percentile
+
+def recreate_round(root, boxes):
+    """The pre-pool behaviour, kept here as the baseline"""
+    windows = []
+    for bbox in boxes:
+        for bx, by, bw, bh in border_rects(bbox, 10, 4):
+            border = tk.Toplevel(root)
+            border.overrideredirect(True)
+            border.attributes("-topmost", True)
+            border.geometry(f"{bw}x{bh}+{bx}+{by}")
+            border.configure(bg="#00FF00")
+            make_click_through(border)
+            windows.append(border)
+    root.update()
+    for border in windows:
+        border.destroy()
+    return len(windows)
+
+def pool_round(root, pool, boxes):
+    for bbox in boxes:
+        pool.show(bbox)
+    root.update()
+    pool.clear()
+
+def summarize(samples):
+    return {
+        "p50": round(percentile(samples, 50), 2),
+        "p95": round(percentile(samples, 95), 2),
+        "max": round(max(samples), 2),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Highlight window benchmark")
+    parser.add_argument("--tags", type=int, default=3)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        raise SystemExit(f"No display available: {e}")
+    root.withdraw()
+    boxes = [(200 + i * 180, 400, 320 + i * 180, 440) for i in range(args.tags)]
+
+    recreate_ms, created = [], 0
+    for _ in range(args.rounds):
+        start = time.perf_counter()
+        created += recreate_round(root, boxes)
+        recreate_ms.append((time.perf_counter() - start) * 1000)
+
+    pool = HighlightPool(root)
+    pool_ms = []
+    for _ in range(args.rounds):
+        start = time.perf_counter()
+        pool_round(root, pool, boxes)
+        pool_ms.append((time.perf_counter() - start) * 1000)
+    pool.destroy()
+    root.destroy()
+
+    print(f"{args.rounds} rounds x {args.tags} tags")
+    print(f"  recreate: {summarize(recreate_ms)} ms, {created} windows created")
+    print(f"  pool:     {summarize(pool_ms)} ms, {pool.created} windows created")
+
+if __name__ == "__main__":
+    main()
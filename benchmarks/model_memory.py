@@ -0,0 +1,106 @@
+"""Compare OCR model memory policies: resident memory and reload latency.
+
+Usage:
+    python -m benchmarks.model_memory path/to/corpus [--engine easyocr] [-o out.json]
+
+Each policy runs in its own fresh process. For each one the model is
+loaded, the corpus scanned, the model unloaded and loaded again, and the
+process (plus model child process, for "subprocess") memory is sampled
+after every step. The reload time is what the first scan after an idle
+unload costs when it isn't hidden by warm-up on hover.
+"""
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from src.engines import ENGINES, DEFAULT_ENGINE
+from src.metrics import percentile
+from src.residency import POLICIES, current_rss_mb, model_rss_mb
+from .corpus import load_corpus, load_image
+
+def _memory(scanner):
+    # The model's child process counts too, it is memory the app is holding
+    return round((current_rss_mb() or 0.0) + (model_rss_mb(scanner) or 0.0), 1)
+
+def run_policy(corpus_dir, engine, policy, profile):
+    # Imported here so each spawned worker pays for its own model load
+    from src.scanner import ScreenScanner
+
+    images = [load_image(path) for path, _ in load_corpus(corpus_dir)]
+    baseline = round(current_rss_mb() or 0.0, 1)
+    scanner = ScreenScanner(profile=profile, engine=engine,
+                            engine_options={"isolated": policy == "subprocess"})
+    scanner.scan_cache.max_entries = 0
+
+    start = time.perf_counter()
+    scanner.warm_up()
+    cold_ms = (time.perf_counter() - start) * 1000
+    loaded = _memory(scanner)
+
+    wall = []
+    for img in images:
+        scan_start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            scanner.scan_for_tags(img)
+        wall.append((time.perf_counter() - scan_start) * 1000)
+    after_scans = _memory(scanner)
+
+    if policy != "resident":
+        scanner.unload()
+    unloaded = _memory(scanner)
+
+    start = time.perf_counter()
+    scanner.warm_up()
+    reload_ms = (time.perf_counter() - start) * 1000
+    scanner.unload()
+
+    return {
+        "policy": policy,
+        "engine": scanner.engine.describe(),
+        "baseline_mb": baseline,
+        "loaded_mb": loaded,
+        "after_scans_mb": after_scans,
+        "idle_mb": unloaded,
+        "cold_load_ms": round(cold_ms, 1),
+        "reload_ms": round(reload_ms, 1) if policy != "resident" else 0.0,
+        "scan_p50_ms": round(percentile(wall, 50), 2),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus", help="Directory with screenshots and labels.json")
+    parser.add_argument("--engine", default=DEFAULT_ENGINE, choices=list(ENGINES))
+    parser.add_argument("--profile", default="baseline")
+    parser.add_argument("--policies", nargs="+", default=list(POLICIES), choices=list(POLICIES))
+    parser.add_argument("-o", "--output", help="Also write the rows as JSON")
+    args = parser.parse_args()
+
+    if not load_corpus(args.corpus):
+        print("Corpus is empty")
+        return
+
+    ctx = multiprocessing.get_context("spawn")
+    rows = []
+    for policy in args.policies:
+        print(f"Running {policy}...")
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+            rows.append(pool.submit(run_policy, args.corpus, args.engine, policy, args.profile).result())
+
+    print(f"\n{'Policy':<14}{'base MB':>9}{'loaded MB':>11}{'scans MB':>10}{'idle MB':>9}"
+          f"{'cold ms':>9}{'reload ms':>11}{'scan p50':>10}")
+    for row in rows:
+        print(f"{row['policy']:<14}{row['baseline_mb']:>9.0f}{row['loaded_mb']:>11.0f}"
+              f"{row['after_scans_mb']:>10.0f}{row['idle_mb']:>9.0f}"
+              f"{row['cold_load_ms']:>9.0f}{row['reload_ms']:>11.0f}{row['scan_p50_ms']:>10.1f}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, indent=2, sort_keys=True)
+        print(f"\nRows written to {args.output}")
+
+if __name__ == "__main__":
+    main()
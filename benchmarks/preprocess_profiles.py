@@ -0,0 +1,84 @@
+"""Compare preprocessing profiles on a labelled screenshot corpus.
+
+Usage:
+    python -m benchmarks.preprocess_profiles path/to/corpus [--profiles baseline fast balanced]
+
+Reports VALID_TAGS recall and p50/p95 scan latency per profile, then
+recommends the fastest profile that keeps the baseline profile's recall
+(the default, the original colour 2x pipeline) - the evidence needed
+before changing DEFAULT_PROFILE.
+"""
+import argparse
+import contextlib
+import io
+import time
+
+from src.engines import ENGINES, DEFAULT_ENGINE
+from src.preprocess import PROFILES, DEFAULT_PROFILE
+from src.scanner import ScreenScanner
+from src.metrics import percentile
+from .corpus import load_corpus, load_image, tag_scores
+
+def run_profile(scanner, profile, corpus, images):
+    scanner.set_profile(profile)
+    latencies = []
+    tp_total = fn_total = 0
+
+    for (path, expected), img in zip(corpus, images):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            found, _ = scanner.scan_for_tags(img)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        tp, _, fn = tag_scores(found.keys(), expected)
+        tp_total += tp
+        fn_total += fn
+        if fn:
+            print(f"  [{profile}] {path.name}: missed {sorted(expected - set(found))}")
+
+    recall = tp_total / (tp_total + fn_total) if tp_total + fn_total else 1.0
+    return {
+        "profile": profile,
+        "recall": recall,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus", help="Directory with screenshots and labels.json")
+    parser.add_argument("--profiles", nargs="+", default=list(PROFILES), choices=list(PROFILES))
+    parser.add_argument("--engine", default=DEFAULT_ENGINE, choices=list(ENGINES))
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    if not corpus:
+        print("Corpus is empty")
+        return
+    images = [load_image(path) for path, _ in corpus]
+
+    # Load the OCR model once so the first profile isn't charged for it
+    scanner = ScreenScanner(engine=args.engine)
+    scanner.scan_cache.max_entries = 0  # measure OCR, not the repeat-scan cache
+    with contextlib.redirect_stdout(io.StringIO()):
+        scanner.scan_for_tags(images[0])
+
+    profiles = args.profiles if DEFAULT_PROFILE in args.profiles else [DEFAULT_PROFILE] + args.profiles
+    rows = [run_profile(scanner, profile, corpus, images) for profile in profiles]
+
+    print(f"\n{'Profile':<12}{'Recall':>9}{'p50 ms':>10}{'p95 ms':>10}")
+    for row in rows:
+        print(f"{row['profile']:<12}{row['recall']:>9.1%}{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}")
+
+    reference = next(r for r in rows if r['profile'] == DEFAULT_PROFILE)
+    matching = [r for r in rows if r['recall'] >= reference['recall']]
+    best = min(matching, key=lambda r: r['p50_ms'])
+    print(f"\n{DEFAULT_PROFILE} recall: {reference['recall']:.1%}")
+    if best is reference:
+        print(f"No profile matching its recall is faster than {DEFAULT_PROFILE}")
+    else:
+        print(f"Fastest profile matching {DEFAULT_PROFILE} recall: {best['profile']} "
+              f"({best['p50_ms']:.1f} vs {reference['p50_ms']:.1f} ms p50)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""Benchmark the full scan pipeline on a labelled screenshot corpus.
+
+Usage:
+    python -m benchmarks.scan_pipeline path/to/corpus [-o run.json] [--baseline old.json]
+
+Runs ScreenScanner.scan_for_tags and RecruitCalculator.calculate on every
+screenshot and writes a JSON report with per-stage latency percentiles
+(crop, resize, detect, recognize, match, calculate), tag precision/recall
+and peak memory, measured in a second pass so it doesn't skew the timings.
+Pass --baseline to print the p50 delta against an older run.
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import time
+import tracemalloc
+from datetime import datetime
+
+from src.calculator import RecruitCalculator
+from src.engines import ENGINES, DEFAULT_ENGINE
+from src.fetcher import GameDataFetcher
+from src.scanner import ScreenScanner
+from src.metrics import percentile
+from src.residency import peak_rss_mb
+from .corpus import load_corpus, load_image, tag_scores
+
+STAGES = ("crop", "resize", "detect", "recognize", "match", "calculate")
+
+def summarize(samples):
+    if not samples:
+        return {"count": 0}
+    return {
+        "count": len(samples),
+        "mean": round(sum(samples) / len(samples), 3),
+        "p50": round(percentile(samples, 50), 3),
+        "p95": round(percentile(samples, 95), 3),
+        "p99": round(percentile(samples, 99), 3),
+        "max": round(max(samples), 3),
+    }
+
+def run(corpus_dir, profile, engine):
+    corpus = load_corpus(corpus_dir)
+    with contextlib.redirect_stdout(io.StringIO()):
+        calculator = RecruitCalculator(GameDataFetcher().fetch_data())
+    scanner = ScreenScanner(profile=profile, engine=engine)
+    scanner.scan_cache.max_entries = 0  # measure OCR, not the repeat-scan cache
+
+    # First scan loads the OCR model; keep it out of the numbers
+    if corpus:
+        with contextlib.redirect_stdout(io.StringIO()):
+            scanner.scan_for_tags(load_image(corpus[0][0]))
+
+    stage_samples = {stage: [] for stage in STAGES + ("total",)}
+    tp_total = fp_total = fn_total = 0
+    per_image = []
+
+    for path, expected in corpus:
+        img = load_image(path)
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            found, _ = scanner.scan_for_tags(img)
+        calc_start = time.perf_counter()
+        results = calculator.calculate(list(found.keys()))
+        end = time.perf_counter()
+
+        timings = dict(scanner.last_timings)
+        timings["calculate"] = (end - calc_start) * 1000
+        timings["total"] = (end - start) * 1000
+        for stage, value in timings.items():
+            stage_samples.setdefault(stage, []).append(value)
+
+        tp, fp, fn = tag_scores(found.keys(), expected)
+        tp_total += tp
+        fp_total += fp
+        fn_total += fn
+        per_image.append({
+            "file": path.name,
+            "expected": sorted(expected),
+            "found": sorted(found),
+            "combos": len(results),
+            "total_ms": round(timings["total"], 3),
+        })
+
+    # Separate pass: tracemalloc's allocation hooks would skew the timings above
+    python_peak = 0
+    tracemalloc.start()
+    for path, _ in corpus:
+        img = load_image(path)
+        tracemalloc.reset_peak()
+        with contextlib.redirect_stdout(io.StringIO()):
+            found, _ = scanner.scan_for_tags(img)
+        calculator.calculate(list(found.keys()))
+        python_peak = max(python_peak, tracemalloc.get_traced_memory()[1])
+        del img
+    tracemalloc.stop()
+
+    rss = peak_rss_mb()
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "profile": scanner.preprocessor.name,
+        "engine": scanner.engine.describe(),
+        "images": len(corpus),
+        "stages_ms": {stage: summarize(samples) for stage, samples in stage_samples.items()},
+        "tags": {
+            "true_positives": tp_total,
+            "false_positives": fp_total,
+            "false_negatives": fn_total,
+            "precision": round(tp_total / (tp_total + fp_total), 4) if tp_total + fp_total else 1.0,
+            "recall": round(tp_total / (tp_total + fn_total), 4) if tp_total + fn_total else 1.0,
+        },
+        "memory_mb": {
+            "python_peak": round(python_peak / (1024 * 1024), 2),
+            "peak_rss": round(rss, 2) if rss is not None else None,
+        },
+        "per_image": per_image,
+    }
+
+def print_comparison(report, baseline):
+    print(f"{'Stage':<12}{'base p50':>10}{'new p50':>10}{'delta':>10}")
+    for stage, summary in report["stages_ms"].items():
+        old = baseline.get("stages_ms", {}).get(stage, {}).get("p50")
+        new = summary.get("p50")
+        if old is None or new is None:
+            continue
+        delta = (new - old) / old if old else 0.0
+        print(f"{stage:<12}{old:>10.1f}{new:>10.1f}{delta:>+10.1%}")
+    for key in ("precision", "recall"):
+        print(f"{key:<12}{baseline['tags'][key]:>10.2%}{report['tags'][key]:>10.2%}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus", help="Directory with screenshots and labels.json")
+    parser.add_argument("-o", "--output", help="Write the JSON report here instead of stdout")
+    parser.add_argument("--profile", default="baseline", help="Preprocessing profile to benchmark")
+    parser.add_argument("--engine", default=DEFAULT_ENGINE, choices=list(ENGINES), help="OCR engine to benchmark")
+    parser.add_argument("--baseline", help="Previous JSON report to compare against")
+    args = parser.parse_args()
+
+    report = run(args.corpus, args.profile, args.engine)
+    text = json.dumps(report, indent=2, sort_keys=True)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+        print(f"Report written to {args.output}")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            print_comparison(report, json.load(f))
+
+if __name__ == "__main__":
+    main()
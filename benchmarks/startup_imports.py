@@ -0,0 +1,76 @@
+"""Check what `import main` pulls in before the overlay window appears.
+
+Usage:
+    python -m benchmarks.startup_imports [--budget-ms 300] [--top 15]
+
+Runs `python -X importtime -c "import main"` in a fresh interpreter and
+reports the slowest imports. Then imports main and src.overlay, each in
+its own interpreter, and checks sys.modules. Exits non-zero if any of
+the heavy scanner or hotkey modules was loaded eagerly, or if the total
+import time goes over the budget, so a stray top-level import shows up
+before it ships.
+"""
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+
+# Must only be imported after the window is up (loader thread or first use)
+DEFERRED_MODULES = ("cv2", "numpy", "PIL", "torch", "easyocr", "pytesseract", "onnxruntime",
+                    "keyboard", "pynput", "requests", "rapidfuzz", "fuzzywuzzy")
+
+def measure_imports(module="main"):
+    """Returns [(module, self_us, cumulative_us)] in import order"""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=ROOT_DIR, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr.strip().splitlines()[-1]}")
+
+    imports = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        imports.append((name.strip(), int(self_us), int(cumulative_us)))
+    return imports
+
+def eager_deferred_modules(module):
+    """DEFERRED_MODULES that end up in sys.modules after a fresh `import module`"""
+    code = f"import sys, {module}; print('\\n'.join(sys.modules))"
+    proc = subprocess.run([sys.executable, "-c", code], cwd=ROOT_DIR, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr.strip().splitlines()[-1]}")
+    loaded = {name.split(".")[0] for name in proc.stdout.split()}
+    return [name for name in DEFERRED_MODULES if name in loaded]
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup import time and deferred-module check")
+    parser.add_argument("--budget-ms", type=float, default=300.0, help="Maximum total import time")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest imports to list")
+    args = parser.parse_args()
+
+    imports = measure_imports()
+    total_ms = sum(self_us for _, self_us, _ in imports) / 1000
+    eager = {module: eager_deferred_modules(module) for module in ("main", "src.overlay")}
+
+    print(f"{'cumulative ms':>14}  module")
+    for name, _, cumulative_us in sorted(imports, key=lambda i: i[2], reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:>14.1f}  {name}")
+    print(f"\nTotal import time: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+    failed = False
+    for module, names in eager.items():
+        if names:
+            print(f"FAIL: import {module} loads {', '.join(names)}")
+            failed = True
+    if total_ms > args.budget_ms:
+        print("FAIL: over the startup import budget")
+        failed = True
+    if not failed:
+        print("OK")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
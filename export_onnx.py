@@ -0,0 +1,44 @@
+"""Export the EasyOCR English recognizer to ONNX for the lightweight 'onnx' engine.
+
+Needs easyocr + torch once, on any machine; the result runs on onnxruntime
+alone. Writes models/text_rec.onnx and models/text_rec_charset.txt.
+"""
+import os
+from src.config import MODELS_DIR, ONNX_REC_MODEL, ONNX_REC_CHARSET
+
+def export(model_path=ONNX_REC_MODEL, charset_path=ONNX_REC_CHARSET):
+    import easyocr
+    import torch
+
+    reader = easyocr.Reader(['en'], gpu=False, verbose=False)
+    model = reader.recognizer
+    if hasattr(model, "module"):
+        model = model.module
+    model.eval()
+
+    # EasyOCR recognizers take a dummy text tensor that is unused at inference
+    class Wrapper(torch.nn.Module):
+        def __init__(self, inner):
+            super().__init__()
+            self.inner = inner
+
+        def forward(self, image):
+            return self.inner(image, None)
+
+    os.makedirs(MODELS_DIR, exist_ok=True)
+    dummy = torch.randn(1, 1, 64, 256)
+    torch.onnx.export(
+        Wrapper(model), dummy, model_path,
+        input_names=["image"], output_names=["logits"],
+        dynamic_axes={"image": {0: "batch", 3: "width"}, "logits": {0: "batch", 1: "steps"}},
+        opset_version=13,
+    )
+
+    with open(charset_path, 'w', encoding='utf-8') as f:
+        f.write(reader.character + "\n")
+
+    print(f"Wrote {model_path}")
+    print(f"Wrote {charset_path}")
+
+if __name__ == "__main__":
+    export()
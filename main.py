@@ -1,10 +1,24 @@
+import argparse
+import multiprocessing
 from src.fetcher import GameDataFetcher
 from src.overlay import OverlayApp
 
 def main():
+    parser = argparse.ArgumentParser(description="Arknights recruitment OCR overlay")
+    parser.add_argument("--profile", nargs="?", type=int, const=5, default=0, metavar="N",
+                        help="Profile startup and the next N scans (default 5) into profiles/")
+    args = parser.parse_args()
+
+    profiler = None
+    if args.profile:
+        from src.profiling import ProfileSession
+        profiler = ProfileSession(scans=args.profile)
+
     fetcher = GameDataFetcher()
-    app = OverlayApp(fetcher)
+    app = OverlayApp(fetcher, profiler=profiler)
     app.run()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # The frozen exe is also what spawns the model subprocess; let it act as the child
+    multiprocessing.freeze_support()
+    main()
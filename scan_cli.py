@@ -0,0 +1,128 @@
+"""Scan saved screenshots without the overlay and stream JSONL results.
+
+Usage:
+    python scan_cli.py screenshots/ "archive/**/*.png" -o results.jsonl -j 4
+
+Each output line holds one screenshot's tags, bboxes, best combos and
+per-stage timings. Screenshots are spread over a process pool where every
+worker keeps its own warm OCR reader.
+"""
+import argparse
+import contextlib
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".bmp", ".webp"}
+
+_pipeline = None
+_options = None
+
+def expand_inputs(inputs):
+    paths = []
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            paths.extend(p for p in sorted(path.rglob("*")) if p.suffix.lower() in IMAGE_EXTENSIONS)
+        elif glob.has_magic(item):
+            paths.extend(Path(p) for p in sorted(glob.glob(item, recursive=True))
+                         if Path(p).suffix.lower() in IMAGE_EXTENSIONS)
+        elif path.exists():
+            paths.append(path)
+        else:
+            print(f"Warning: {item} not found", file=sys.stderr)
+    return paths
+
+def _init_worker(pool, scanner_options, options):
+    global _pipeline, _options
+    # Scanner progress output would corrupt the JSONL stream
+    sys.stdout = sys.stderr if options["verbose"] else open(os.devnull, 'w')
+
+    from src.pipeline import RecruitPipeline
+    _pipeline = RecruitPipeline(pool, **scanner_options)
+    _pipeline.warm_up()
+    _options = options
+
+def _scan_file(path):
+    import cv2
+    record = {"file": str(path), "worker": os.getpid()}
+    try:
+        img = cv2.imread(str(path), cv2.IMREAD_COLOR)
+        if img is None:
+            raise ValueError("unreadable image")
+        record.update(_pipeline.process(img, sort_mode=_options["sort"], top=_options["top"]))
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+    return record
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("inputs", nargs="+", help="Screenshot files, directories or glob patterns")
+    parser.add_argument("-o", "--output", help="JSONL output file (default: stdout)")
+    parser.add_argument("-j", "--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--threads", type=int, default=None,
+                        help="Inference threads per worker (default: cores / workers)")
+    parser.add_argument("--profile", default="baseline", help="Preprocessing profile")
+    parser.add_argument("--engine", default="easyocr", help="OCR engine")
+    parser.add_argument("--sort", choices=["min", "max"], default="min")
+    parser.add_argument("--top", type=int, default=10, help="Combos per screenshot, 0 = all")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Show scanner output on stderr")
+    args = parser.parse_args()
+
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        print("No screenshots found", file=sys.stderr)
+        return 1
+
+    from src.fetcher import GameDataFetcher
+    with contextlib.redirect_stdout(sys.stderr):
+        pool = GameDataFetcher().fetch_data()
+    if not pool:
+        print("No operator data available", file=sys.stderr)
+        return 1
+
+    workers = max(1, min(args.workers, len(paths)))
+    threads = args.threads or max(1, (os.cpu_count() or 1) // workers)
+    scanner_options = {"profile": args.profile, "engine": args.engine,
+                       "engine_options": {"threads": threads}}
+    options = {"sort": args.sort, "top": args.top, "verbose": args.verbose}
+
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    start = time.perf_counter()
+    done = errors = 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(pool, scanner_options, options)) as executor:
+            # Keep a bounded number of files in flight so huge archives stream
+            pending = set()
+            queue = iter(paths)
+            for path in queue:
+                pending.add(executor.submit(_scan_file, path))
+                if len(pending) >= workers * 4:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        errors += _emit(out, future.result())
+                        done += 1
+            for future in pending:
+                errors += _emit(out, future.result())
+                done += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"Scanned {done} screenshots ({errors} errors) in {elapsed:.1f}s "
+          f"with {workers} workers ({done / elapsed:.2f}/s)", file=sys.stderr)
+    return 0
+
+def _emit(out, record):
+    out.write(json.dumps(record) + "\n")
+    out.flush()
+    return 1 if "error" in record else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
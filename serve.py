@@ -0,0 +1,60 @@
+"""Run the scan and calculate pipeline as a local JSON service, no overlay.
+
+Usage:
+    python serve.py [--port 8765] [-j 2] [--max-queue 8]
+
+    curl --data-binary @screenshot.png -H "Content-Type: image/png" localhost:8765/scan
+    curl -d '{"tags": ["Top Operator", "Guard"]}' localhost:8765/calculate
+    curl localhost:8765/health
+    curl localhost:8765/metrics
+
+Each worker keeps its own warm OCR reader; scans beyond the worker count
+wait in a bounded queue and get 503 + Retry-After once it is full. Inference
+thread pools are process-wide, so with more than one worker each reader
+runs in its own child process and --threads really is per worker.
+"""
+import argparse
+import os
+import sys
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: localhost only)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("-j", "--workers", type=int, default=1, help="OCR workers, each with its own reader")
+    parser.add_argument("--max-queue", type=int, default=8, help="Scans allowed to wait for a worker")
+    parser.add_argument("--threads", type=int, default=None,
+                        help="Inference threads per worker (default: cores / workers); "
+                             "with -j > 1 each worker gets its own process")
+    parser.add_argument("--profile", default="baseline", help="Preprocessing profile")
+    parser.add_argument("--engine", default="easyocr", help="OCR engine")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    from src.fetcher import GameDataFetcher
+    from src.service import RecruitService, create_server
+
+    pool = GameDataFetcher().fetch_data()
+    if not pool:
+        print("No operator data available", file=sys.stderr)
+        return 1
+
+    workers = max(1, args.workers)
+    threads = args.threads or max(1, (os.cpu_count() or 1) // workers)
+    print(f"Loading {workers} OCR worker(s)...")
+    service = RecruitService(pool, workers=workers, max_queue=args.max_queue,
+                             profile=args.profile, engine=args.engine,
+                             engine_options={"threads": threads, "isolated": workers > 1})
+
+    server = create_server(service, args.host, args.port, verbose=args.verbose)
+    print(f"Serving on http://{args.host}:{args.port} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
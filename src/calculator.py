@@ -32,63 +32,104 @@ class RecruitCalculator:
         
         for r in range(1, 4):
             for combo in combinations(selected_tags, r):
-                combo_set = frozenset(combo)
-                
-                if not combo:
-                    continue
-                
-                first_tag = combo[0]
-                if first_tag not in self._tag_index:
-                    continue
-                
-                candidate_indices = set(self._tag_index[first_tag])
-                for tag in combo[1:]:
-                    if tag not in self._tag_index:
-                        candidate_indices = set()
-                        break
-                    candidate_indices &= set(self._tag_index[tag])
-                
-                if not candidate_indices:
-                    continue
-                
-                has_top_op = "top operator" in combo_set
-                has_robot = "robot" in combo_set
-                has_starter = "starter" in combo_set
-                
-                matches = []
-                min_rarity = 7
-                max_rarity = 0
-                
-                for idx in candidate_indices:
-                    op = self.pool[idx]
-                    rarity = op['rarity']
-                    
-                    if rarity == 6 and not has_top_op:
-                        continue
-                    if rarity == 1 and not has_robot:
-                        continue
-                    if rarity <= 2 and not has_robot and not has_starter:
-                        continue
-                    
-                    matches.append(op)
-                    if rarity < min_rarity:
-                        min_rarity = rarity
-                    if rarity > max_rarity:
-                        max_rarity = rarity
+                result = self._combo_result(combo)
+                if result:
+                    results.append(result)
 
-                if not matches:
-                    continue
-                
-                results.append({
-                    "tags": list(combo),
-                    "min": min_rarity,
-                    "max": max_rarity,
-                    "ops": sorted(matches, key=lambda x: x['rarity'], reverse=True)
-                })
+        sort_results(results, sort_mode)
+        return results
 
-        if sort_mode == "max":
-            results.sort(key=lambda x: (x['max'], x['min'], -len(x['ops'])), reverse=True)
-        else:
-            results.sort(key=lambda x: (x['min'], x['max'], -len(x['ops'])), reverse=True)
+    def extend(self, results, selected_tags, new_tag, sort_mode="min"):
+        """Results for selected_tags + [new_tag], given `results` for selected_tags.
 
-        return results
\ No newline at end of file
+        Only the combos that include the new tag are computed; the rest are
+        reused. The returned list is ordered exactly as calculate() would
+        order it for the full tag list.
+        """
+        selected_tags = [t.lower() for t in selected_tags]
+        new_tag = new_tag.lower()
+        if new_tag in selected_tags:
+            return results
+        
+        extended = list(results)
+        for r in range(0, 3):
+            for combo in combinations(selected_tags, r):
+                result = self._combo_result(combo + (new_tag,))
+                if result:
+                    extended.append(result)
+        
+        # calculate() sorts combos in enumeration order, so ties fall back to it
+        position = {tag: i for i, tag in enumerate(selected_tags + [new_tag])}
+        extended.sort(key=lambda x: (len(x['tags']), [position[t] for t in x['tags']]))
+        sort_results(extended, sort_mode)
+        return extended
+
+    def without(self, results, tag):
+        """Results with `tag` dropped from the selection, given `results` that included it.
+
+        Nothing is recomputed: the combos that don't use the tag are
+        exactly the ones calculate() would return without it, in the same order.
+        """
+        tag = tag.lower()
+        return [r for r in results if tag not in r['tags']]
+
+    def _combo_result(self, combo):
+        combo_set = frozenset(combo)
+        
+        if not combo:
+            return None
+        
+        first_tag = combo[0]
+        if first_tag not in self._tag_index:
+            return None
+        
+        candidate_indices = set(self._tag_index[first_tag])
+        for tag in combo[1:]:
+            if tag not in self._tag_index:
+                return None
+            candidate_indices &= set(self._tag_index[tag])
+        
+        if not candidate_indices:
+            return None
+        
+        has_top_op = "top operator" in combo_set
+        has_robot = "robot" in combo_set
+        has_starter = "starter" in combo_set
+        
+        matches = []
+        min_rarity = 7
+        max_rarity = 0
+        
+        for idx in candidate_indices:
+            op = self.pool[idx]
+            rarity = op['rarity']
+            
+            if rarity == 6 and not has_top_op:
+                continue
+            if rarity == 1 and not has_robot:
+                continue
+            if rarity <= 2 and not has_robot and not has_starter:
+                continue
+            
+            matches.append(op)
+            if rarity < min_rarity:
+                min_rarity = rarity
+            if rarity > max_rarity:
+                max_rarity = rarity
+
+        if not matches:
+            return None
+        
+        return {
+            "tags": list(combo),
+            "min": min_rarity,
+            "max": max_rarity,
+            "ops": sorted(matches, key=lambda x: x['rarity'], reverse=True)
+        }
+
+
+def sort_results(results, sort_mode="min"):
+    if sort_mode == "max":
+        results.sort(key=lambda x: (x['max'], x['min'], -len(x['ops'])), reverse=True)
+    else:
+        results.sort(key=lambda x: (x['min'], x['max'], -len(x['ops'])), reverse=True)
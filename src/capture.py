@@ -0,0 +1,99 @@
+import time
+from .metrics import METRICS
+
+def rects_intersect(a, b):
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+def mask_rects(roi, offset, rects):
+    """Blank screen rects (x1, y1, x2, y2) inside a ROI whose top-left is at offset"""
+    ox, oy = offset
+    h, w = roi.shape[:2]
+    for x1, y1, x2, y2 in rects:
+        x1, x2 = max(0, x1 - ox), min(w, x2 - ox)
+        y1, y2 = max(0, y1 - oy), min(h, y2 - oy)
+        if x1 < x2 and y1 < y2:
+            roi[y1:y2, x1:x2] = 0
+
+def window_rect(window):
+    x, y = window.winfo_rootx(), window.winfo_rooty()
+    return x, y, x + window.winfo_width(), y + window.winfo_height()
+
+def flush_compositor():
+    """Block until the desktop compositor has presented a frame (Windows only)"""
+    try:
+        import ctypes
+        ctypes.windll.dwmapi.DwmFlush()
+        return True
+    except Exception:
+        return False
+
+def wait_for_unmap(window, timeout=0.3):
+    """Pump Tk until the window reports unmapped, then let the compositor catch up.
+
+    Returns the time waited in ms. Replaces a fixed sleep: usually this is
+    one event-loop round trip plus one frame.
+    """
+    start = time.perf_counter()
+    deadline = start + timeout
+    window.update_idletasks()
+    while window.winfo_ismapped() and time.perf_counter() < deadline:
+        window.update()
+        time.sleep(0.005)
+    if not flush_compositor():
+        # No compositor call to wait on; give the window manager a few ms
+        window.update()
+        time.sleep(0.02)
+    return (time.perf_counter() - start) * 1000
+
+class OverlayCapture:
+    """Grabs the tag area without hiding the overlay whenever possible.
+
+    Only the ROI is captured. If the overlay window doesn't overlap it, the
+    window stays up; our other windows (cleared highlights, the tooltip)
+    have known geometry and are blanked in the capture instead. The
+    overlay is withdrawn only when it actually covers the tag area, and
+    then only until the unmap is confirmed, not for a fixed delay.
+    Call restore() when done with the screen.
+    """
+    __slots__ = ('scanner', 'window', 'unmap_timeout', 'hidden', '_screen_size')
+
+    def __init__(self, scanner, window, unmap_timeout=0.3):
+        self.scanner = scanner
+        self.window = window
+        self.unmap_timeout = unmap_timeout
+        self.hidden = False
+        self._screen_size = None
+
+    def screen_size(self):
+        # Grab size, not Tk's, since DPI scaling can make the two disagree
+        if self._screen_size is None:
+            from PIL import ImageGrab
+            self._screen_size = ImageGrab.grab().size
+        return self._screen_size
+
+    def capture(self, own_rects=()):
+        """Returns (roi, offset) for ScreenScanner.scan_roi"""
+        screen_size = self.screen_size()
+        roi_rect = self.scanner.roi_rect(*screen_size)
+        if rects_intersect(window_rect(self.window), roi_rect):
+            self.hide()
+
+        with METRICS.span("capture"):
+            roi, offset = self.scanner.capture_roi(screen_size)
+            mask_rects(roi, offset, own_rects)
+        return roi, offset
+
+    def hide(self):
+        """Withdraw the overlay until restore(); returns once it is off screen"""
+        if self.hidden:
+            return
+        with METRICS.span("hide_window"):
+            self.window.withdraw()
+            wait_for_unmap(self.window, self.unmap_timeout)
+        self.hidden = True
+
+    def restore(self):
+        if self.hidden:
+            with METRICS.span("show_window"):
+                self.window.deiconify()
+            self.hidden = False
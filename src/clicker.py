@@ -0,0 +1,153 @@
+import threading
+import time
+
+class ScreenBackend:
+    """Real mouse and screen. Anything with the same three methods can stand
+    in for it, e.g. a fake that flips a region's pixels when clicked."""
+    __slots__ = ()
+
+    def move(self, x, y):
+        import pyautogui
+        pyautogui.moveTo(x, y, _pause=False)
+
+    def click(self, x, y):
+        import pyautogui
+        pyautogui.click(x, y, _pause=False)
+
+    def grab(self, bbox):
+        """Pixels of screen rect (x1, y1, x2, y2) as an array"""
+        import numpy as np
+        from PIL import ImageGrab
+        return np.asarray(ImageGrab.grab(bbox=bbox))
+
+def _inner(bbox, inset=0.2):
+    # Sample inside the tag box, away from its border and neighbours
+    x1, y1, x2, y2 = bbox
+    dx, dy = int((x2 - x1) * inset), int((y2 - y1) * inset)
+    return x1 + dx, y1 + dy, max(x1 + dx + 1, x2 - dx), max(y1 + dy + 1, y2 - dy)
+
+def _difference(a, b):
+    import numpy as np
+    if a.shape != b.shape:
+        return float("inf")
+    return float(np.abs(a.astype(np.int16) - b.astype(np.int16)).mean())
+
+def _brightening(a, b):
+    # How much lighter b is than a on average; negative when it got darker
+    return float(b.mean()) - float(a.mean())
+
+class ClickExecutor:
+    """Clicks tags on a worker thread and confirms each click registered.
+
+    The cursor is moved onto the tag first and given one `poll` interval to
+    settle, so hover effects are in the baseline sample. After clicking,
+    the tag's pixels are re-sampled every `poll` seconds until they get
+    brighter (or darker, with `selected_brighter=False`) by more than
+    `change_threshold`, i.e. the tag switched to its selected look. The
+    next tag is clicked as soon as that happens instead of after a fixed
+    delay.
+
+    A click that shows no change within `timeout` is retried `retries`
+    times, but only if the tag still looks like the baseline; one that
+    reacted late counts as registered. A change the other way means the
+    tag was already selected and the click turned it off, so it is clicked
+    once more to put it back. Anything else stops the run so no further
+    tags are toggled on a screen that isn't responding as expected.
+    """
+    __slots__ = ('backend', 'timeout', 'poll', 'retries', 'change_threshold', 'selected_brighter', '_thread')
+
+    def __init__(self, backend=None, timeout=0.5, poll=0.015, retries=1, change_threshold=12.0,
+                 selected_brighter=True):
+        self.backend = backend if backend is not None else ScreenBackend()
+        self.timeout = timeout
+        self.poll = poll
+        self.retries = retries
+        self.change_threshold = change_threshold
+        self.selected_brighter = selected_brighter
+        self._thread = None
+
+    @property
+    def busy(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def run(self, targets, on_done):
+        """Click [(tag, bbox)] in the background; on_done(result) is called
+        from the worker thread. Returns False if a run is already going."""
+        if self.busy:
+            return False
+        self._thread = threading.Thread(target=lambda: on_done(self.click_all(targets)),
+                                        name="ClickExecutor", daemon=True)
+        self._thread.start()
+        return True
+
+    def click_all(self, targets):
+        """Returns {"clicked": [tags], "failed": tag or None, "error": str or None, "ms": float}"""
+        start = time.perf_counter()
+        clicked = []
+        failed = error = None
+        for tag, bbox in targets:
+            try:
+                confirmed = self.click_and_confirm(bbox)
+            except Exception as e:
+                confirmed = False
+                error = f"{type(e).__name__}: {e}"
+            if not confirmed:
+                failed = tag
+                break
+            clicked.append(tag)
+        return {"clicked": clicked, "failed": failed, "error": error,
+                "ms": (time.perf_counter() - start) * 1000}
+
+    def click_and_confirm(self, bbox):
+        """True once the tag shows its selected look"""
+        x1, y1, x2, y2 = bbox
+        x, y = (x1 + x2) // 2, (y1 + y2) // 2
+        region = _inner(bbox)
+
+        self.backend.move(x, y)
+        time.sleep(self.poll)
+        before = self.backend.grab(region)
+        for attempt in range(1 + self.retries):
+            if attempt:
+                # The last click may have landed after the timeout
+                state = self._state(before, self.backend.grab(region))
+                if state is None:
+                    return False
+                if state:
+                    return self._settle(x, y, region, before, state)
+            self.backend.click(x, y)
+            state = self._wait_for_state(region, before)
+            if state:
+                return self._settle(x, y, region, before, state)
+        return False
+
+    def _settle(self, x, y, region, before, state):
+        if state == 1:
+            return True
+        # Deselected: it was already on, so click it back on
+        off = self.backend.grab(region)
+        self.backend.click(x, y)
+        return self._wait_for_state(region, off) == 1
+
+    def _state(self, before, now):
+        """1 selected, -1 deselected, 0 unchanged, None changed some other way"""
+        change = _brightening(before, now)
+        if not self.selected_brighter:
+            change = -change
+        if change > self.change_threshold:
+            return 1
+        if change < -self.change_threshold:
+            return -1
+        if _difference(before, now) > self.change_threshold:
+            return None
+        return 0
+
+    def _wait_for_state(self, region, before):
+        deadline = time.perf_counter() + self.timeout
+        while True:
+            state = self._state(before, self.backend.grab(region))
+            if state != 0:
+                return state
+            if time.perf_counter() >= deadline:
+                return 0
+            time.sleep(self.poll)
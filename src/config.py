@@ -5,6 +5,10 @@ CHAR_TABLE_URL = "https://raw.githubusercontent.com/ArknightsAssets/ArknightsGam
 
 TESSERACT_CMD = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
 
+MODELS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models")
+ONNX_REC_MODEL = os.path.join(MODELS_DIR, "text_rec.onnx")
+ONNX_REC_CHARSET = os.path.join(MODELS_DIR, "text_rec_charset.txt")
+
 VALID_TAGS = [
     "Guard", "Sniper", "Defender", "Medic", "Supporter", "Caster", "Specialist", "Vanguard",
     "Melee", "Ranged", "Top Operator", "Senior Operator", "Starter", "Robot",
@@ -0,0 +1,121 @@
+import json
+from collections import OrderedDict
+from pathlib import Path
+from .config import VALID_TAGS
+from .matcher import normalize
+
+CORRECTIONS_FILE = Path(__file__).parent.parent / ".ocr_corrections.json"
+MAX_ENTRIES = 500
+
+_CANONICAL = {t.lower(): t for t in VALID_TAGS}
+
+def is_tag_name(text):
+    """True if `text` normalizes to a tag name, i.e. it was read correctly"""
+    return normalize(text) in _CANONICAL
+
+class CorrectionCache:
+    """Bounded LRU map of raw OCR strings to user-confirmed tags.
+
+    Recurring misreads ("Crowd-Contro1", "DP-Recoverv") resolve with one dict
+    lookup instead of a fuzzy search, and can't fall under the score cutoff.
+    """
+    __slots__ = ('path', 'max_entries', '_aliases', 'hits', 'misses', 'evictions', '_dirty')
+
+    def __init__(self, path=CORRECTIONS_FILE, max_entries=MAX_ENTRIES):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self._aliases = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._dirty = False
+        self._load()
+
+    def __len__(self):
+        return len(self._aliases)
+
+    def lookup(self, text):
+        key = normalize(text)
+        tag = self._aliases.get(key)
+        if tag is None:
+            self.misses += 1
+            return None
+        self._aliases.move_to_end(key)
+        self.hits += 1
+        return tag
+
+    def learn(self, text, tag):
+        """Remember that `text` was read for `tag`. Returns True if it was new.
+
+        Texts that are themselves a tag name are never learned.
+        """
+        key = normalize(text)
+        tag = _CANONICAL.get(tag.lower())
+        # A correct read of another tag must never be remapped; lookups run
+        # before fuzzy matching, so such an alias would override exact reads
+        if not key or tag is None or key in _CANONICAL:
+            return False
+
+        is_new = self._aliases.get(key) != tag
+        self._aliases[key] = tag
+        self._aliases.move_to_end(key)
+        while len(self._aliases) > self.max_entries:
+            self._aliases.popitem(last=False)
+            self.evictions += 1
+        if is_new:
+            self._dirty = True
+        return is_new
+
+    def forget(self, text):
+        if self._aliases.pop(normalize(text), None) is not None:
+            self._dirty = True
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._aliases),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def aliases(self):
+        return dict(self._aliases)
+
+    def export(self, path):
+        """Write the learned aliases, grouped by tag, to a JSON file"""
+        by_tag = {}
+        for raw, tag in self._aliases.items():
+            by_tag.setdefault(tag, []).append(raw)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({tag: sorted(raws) for tag, raws in sorted(by_tag.items())}, f, indent=2)
+        return len(self._aliases)
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            # Stored least-recently-used first, so insertion order is the LRU order
+            for raw, tag in data.get("aliases", []):
+                # Skip aliases of exact tag names saved by older versions
+                if tag.lower() in _CANONICAL and raw not in _CANONICAL:
+                    self._aliases[raw] = _CANONICAL[tag.lower()]
+            while len(self._aliases) > self.max_entries:
+                self._aliases.popitem(last=False)
+        except Exception as e:
+            print(f"Error loading OCR corrections: {e}")
+
+    def save(self):
+        if not self._dirty:
+            return True
+        try:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump({"version": 1, "aliases": list(self._aliases.items())}, f)
+            self._dirty = False
+            return True
+        except Exception as e:
+            print(f"Error saving OCR corrections: {e}")
+            return False
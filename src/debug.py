@@ -0,0 +1,106 @@
+import json
+import logging
+import queue
+import threading
+from collections import deque
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+LOG_FILE = ROOT_DIR / "ocr_debug.log"
+DUMP_DIR = ROOT_DIR / "debug_dumps"
+
+class DebugRecorder:
+    """Keeps the last N scans in memory and logs them off the scan thread.
+
+    record() only appends to a bounded deque and enqueues log lines; the
+    file writes happen on a QueueListener thread and the ROI images are
+    only encoded when dump() is asked for. The scanner holds None instead
+    of a recorder when debugging is off, so the hot path does no debug
+    work at all.
+    """
+    __slots__ = ('scans', 'max_frame_side', '_logger', '_listener', '_file_handler', '_queue_handler', '_counter')
+
+    def __init__(self, ring_size=20, log_file=LOG_FILE, max_bytes=1024 * 1024, backups=3, max_frame_side=1024):
+        self.scans = deque(maxlen=ring_size)
+        # Buffered ROIs are shrunk to this; a full 2x-upscaled ROI is ~5 MB
+        self.max_frame_side = max_frame_side
+        self._counter = 0
+
+        self._file_handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backups, encoding='utf-8')
+        self._file_handler.setFormatter(logging.Formatter("[%(asctime)s] %(message)s", "%Y-%m-%d %H:%M:%S"))
+
+        log_queue = queue.Queue(-1)
+        self._listener = QueueListener(log_queue, self._file_handler)
+        self._listener.start()
+
+        self._logger = logging.getLogger(f"{__name__}.{id(self)}")
+        self._logger.setLevel(logging.INFO)
+        self._logger.propagate = False
+        self._queue_handler = QueueHandler(log_queue)
+        self._logger.addHandler(self._queue_handler)
+
+    def record(self, roi, regions, matches, timings, source="scan"):
+        """regions: raw engine output; matches: [(tag, rect, score, text)]"""
+        self._counter += 1
+        entry = {
+            "id": self._counter,
+            "time": datetime.now(),
+            "source": source,
+            "roi": self._shrink(roi),
+            "regions": [(text, float(conf)) for _, text, conf in regions],
+            "matches": [(tag, float(score), text) for tag, _, score, text in matches],
+            "timings": dict(timings),
+        }
+        self.scans.append(entry)
+
+        self._logger.info("scan #%d (%s) roi=%dx%d", entry["id"], source, roi.shape[1], roi.shape[0])
+        for text, conf in entry["regions"]:
+            self._logger.info("  region '%s' conf=%.2f", text, conf)
+        for tag, score, text in entry["matches"]:
+            self._logger.info("  match '%s' -> '%s' score=%.0f", text, tag, score)
+        self._logger.info("  timings %s", {k: round(v, 1) for k, v in entry["timings"].items()})
+
+    def _shrink(self, roi):
+        h, w = roi.shape[:2]
+        if max(h, w) <= self.max_frame_side:
+            return roi
+        import cv2
+        factor = self.max_frame_side / max(h, w)
+        return cv2.resize(roi, (max(1, int(w * factor)), max(1, int(h * factor))), interpolation=cv2.INTER_AREA)
+
+    def log(self, message, *args):
+        self._logger.info(message, *args)
+
+    def dump(self, directory=None, on_done=None):
+        """Write the buffered scans (PNG + JSON each) on a background thread.
+
+        Returns the target directory; on_done(path, count) is called from
+        the writer thread when finished.
+        """
+        target = Path(directory) if directory else DUMP_DIR / datetime.now().strftime("%Y%m%d_%H%M%S")
+        snapshot = list(self.scans)
+
+        def write():
+            import cv2
+            target.mkdir(parents=True, exist_ok=True)
+            for entry in snapshot:
+                stem = f"scan_{entry['id']:04d}"
+                cv2.imwrite(str(target / f"{stem}.png"), entry["roi"])
+                meta = {k: v for k, v in entry.items() if k != "roi"}
+                meta["time"] = entry["time"].isoformat(timespec="milliseconds")
+                with open(target / f"{stem}.json", 'w', encoding='utf-8') as f:
+                    json.dump(meta, f, indent=2)
+            if on_done:
+                on_done(target, len(snapshot))
+
+        threading.Thread(target=write, name="DebugDump", daemon=True).start()
+        return target
+
+    def close(self):
+        self._listener.stop()
+        self._logger.removeHandler(self._queue_handler)
+        self._file_handler.close()
+        # Loggers live in a global registry; drop ours so toggles don't pile up
+        logging.Logger.manager.loggerDict.pop(self._logger.name, None)
@@ -0,0 +1,473 @@
+import os
+import threading
+import cv2
+import numpy as np
+from .config import TESSERACT_CMD, ONNX_REC_MODEL, ONNX_REC_CHARSET
+
+# Every engine splits OCR into detect() and recognize() so the stages can be
+# timed separately. detect() returns an engine-specific region list which is
+# handed back to recognize(); recognize() returns EasyOCR-style results:
+# [(four_corner_points, text, confidence), ...] in image coordinates.
+
+class OCREngine:
+    """Common options:
+    threads     -- intra-op CPU threads for inference, 0 = library default
+    quantize    -- use dynamic int8 models where the engine supports it
+    small_input -- trade some accuracy for a smaller detection input
+    """
+    __slots__ = ('loaded', 'threads', 'quantize', 'small_input')
+    name = None
+
+    def __init__(self, threads=0, quantize=False, small_input=False):
+        self.loaded = False
+        self.threads = threads
+        self.quantize = quantize
+        self.small_input = small_input
+
+    def preload(self):
+        """Import the backing library without loading a model (safe off the UI thread)"""
+
+    def load(self):
+        self.loaded = True
+
+    def unload(self):
+        self.loaded = False
+
+    def detect(self, img):
+        raise NotImplementedError
+
+    def recognize(self, img, regions):
+        raise NotImplementedError
+
+    def split_regions(self, regions):
+        """Split detect() output into chunks recognize() accepts one at a time,
+        in reading order. Engines that can't split return a single chunk."""
+        return [regions]
+
+    def readtext(self, img):
+        return self.recognize(img, self.detect(img))
+
+    def describe(self):
+        return self.name
+
+
+def _rect_to_points(x1, y1, x2, y2):
+    return [[x1, y1], [x2, y1], [x2, y2], [x1, y2]]
+
+
+def find_text_boxes(img, min_height=8):
+    """Cheap OpenCV text-line detector for engines without their own.
+
+    Tag buttons are light text on flat dark panels, so a morphological
+    gradient plus a wide horizontal close is enough to group letters
+    into one box per tag. Returns (x1, y1, x2, y2) rects, top-to-bottom.
+    """
+    gray = img if img.ndim == 2 else cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    h, w = gray.shape
+
+    gradient = cv2.morphologyEx(gray, cv2.MORPH_GRADIENT, np.ones((3, 3), np.uint8))
+    _, binary = cv2.threshold(gradient, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    joined = cv2.morphologyEx(binary, cv2.MORPH_CLOSE,
+                              cv2.getStructuringElement(cv2.MORPH_RECT, (max(9, w // 60), 1)))
+
+    contours, _ = cv2.findContours(joined, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    boxes = []
+    for contour in contours:
+        x, y, bw, bh = cv2.boundingRect(contour)
+        if bh < min_height or bh > h * 0.5 or bw < bh:
+            continue
+        pad = max(2, bh // 6)
+        boxes.append((max(0, x - pad), max(0, y - pad), min(w, x + bw + pad), min(h, y + bh + pad)))
+
+    boxes.sort(key=lambda b: (b[1] // max(1, min_height * 2), b[0]))
+    return boxes
+
+
+class EasyOCREngine(OCREngine):
+    __slots__ = ('reader', 'gpu')
+    name = "easyocr"
+    # Longest side fed to the CRAFT detector; readtext() defaults to 2560.
+    # Recognition still runs on full-resolution crops.
+    small_canvas_size = 1280
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.reader = None
+        self.gpu = None
+
+    def preload(self):
+        try:
+            import easyocr
+        except ImportError:
+            pass
+
+    def load(self):
+        if self.loaded:
+            return
+        import easyocr
+        print("Initializing EasyOCR...")
+
+        self.gpu = self._check_gpu()
+        if self.threads:
+            self._set_torch_threads(self.threads)
+        # EasyOCR quantizes both its models to dynamic int8 on CPU unless told
+        # not to, so this flag is what actually selects full precision
+        self.reader = easyocr.Reader(['en'], gpu=self.gpu, quantize=self.quantize and not self.gpu,
+                                     verbose=False)
+        self.loaded = True
+        print(f"EasyOCR ready ({self.describe()})")
+
+    def _set_torch_threads(self, threads):
+        import torch
+        torch.set_num_threads(threads)
+        try:
+            # Only allowed before any inter-op work has started
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            pass
+
+    def unload(self):
+        self.reader = None
+        self.loaded = False
+
+    def _check_gpu(self):
+        try:
+            import torch
+            return torch.cuda.is_available()
+        except ImportError:
+            return False
+        except Exception:
+            return False
+
+    def detect(self, img):
+        # Same as reader.readtext(), split so detection and recognition can be timed
+        from easyocr.utils import reformat_input
+
+        img, img_grey = reformat_input(img)
+        if self.small_input:
+            horizontal_list, free_list = self.reader.detect(img, canvas_size=self.small_canvas_size)
+        else:
+            horizontal_list, free_list = self.reader.detect(img)
+        return img_grey, horizontal_list[0], free_list[0]
+
+    def recognize(self, img, regions):
+        img_grey, horizontal_list, free_list = regions
+        return self.reader.recognize(img_grey, horizontal_list, free_list)
+
+    def split_regions(self, regions):
+        img_grey, horizontal_list, free_list = regions
+        # horizontal_list boxes are [x_min, x_max, y_min, y_max]
+        ordered = sorted(horizontal_list, key=lambda b: (b[2], b[0]))
+        return [(img_grey, [box], []) for box in ordered] + [(img_grey, [], [box]) for box in free_list]
+
+    def describe(self):
+        parts = ["GPU" if self.gpu else "CPU"]
+        if self.threads:
+            parts.append(f"{self.threads} threads")
+        if self.quantize and not self.gpu:
+            parts.append("int8")
+        if self.small_input:
+            parts.append("small input")
+        return f"{self.name} ({', '.join(parts)})"
+
+
+class TesseractEngine(OCREngine):
+    """Tesseract via pytesseract. One process call per scan (sparse-text mode),
+    so all the work is accounted to recognize()."""
+    __slots__ = ('pytesseract',)
+    name = "tesseract"
+    config = "--psm 11"
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.pytesseract = None
+
+    def preload(self):
+        try:
+            import pytesseract
+        except ImportError:
+            pass
+
+    def load(self):
+        if self.loaded:
+            return
+        if self.threads:
+            os.environ["OMP_THREAD_LIMIT"] = str(self.threads)
+        import pytesseract
+        if os.path.exists(TESSERACT_CMD):
+            pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
+        print(f"Tesseract ready ({pytesseract.get_tesseract_version()})")
+        self.pytesseract = pytesseract
+        self.loaded = True
+
+    def detect(self, img):
+        return None
+
+    def recognize(self, img, regions):
+        data = self.pytesseract.image_to_data(img, config=self.config,
+                                              output_type=self.pytesseract.Output.DICT)
+
+        # Group words into lines so multi-word tags come back as one region
+        lines = {}
+        for i, word in enumerate(data["text"]):
+            word = word.strip()
+            conf = float(data["conf"][i])
+            if not word or conf < 0:
+                continue
+            key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+            lines.setdefault(key, []).append(i)
+
+        results = []
+        for indices in lines.values():
+            x1 = min(data["left"][i] for i in indices)
+            y1 = min(data["top"][i] for i in indices)
+            x2 = max(data["left"][i] + data["width"][i] for i in indices)
+            y2 = max(data["top"][i] + data["height"][i] for i in indices)
+            text = " ".join(data["text"][i].strip() for i in indices)
+            conf = sum(float(data["conf"][i]) for i in indices) / len(indices) / 100
+            results.append((_rect_to_points(x1, y1, x2, y2), text, conf))
+        return results
+
+
+class ONNXEngine(OCREngine):
+    """CTC text recognizer on ONNX Runtime with the OpenCV box detector.
+
+    Expects a model taking (N, 1, H, W) float input in [-1, 1] and returning
+    (N, T, C) logits, plus a charset file whose characters map to classes
+    1..C-1 (class 0 is the CTC blank). export_onnx.py produces both from
+    the EasyOCR recognizer.
+    """
+    __slots__ = ('model_path', 'charset_path', 'session', 'charset', 'input_name', 'input_height')
+    name = "onnx"
+
+    def __init__(self, model_path=ONNX_REC_MODEL, charset_path=ONNX_REC_CHARSET, **options):
+        super().__init__(**options)
+        self.model_path = model_path
+        self.charset_path = charset_path
+        self.session = None
+        self.charset = None
+        self.input_name = None
+        self.input_height = 64
+
+    def preload(self):
+        try:
+            import onnxruntime
+        except ImportError:
+            pass
+
+    def load(self):
+        if self.loaded:
+            return
+        import onnxruntime as ort
+
+        if not os.path.exists(self.model_path):
+            raise FileNotFoundError(f"ONNX model not found: {self.model_path}")
+        with open(self.charset_path, 'r', encoding='utf-8') as f:
+            self.charset = f.read().rstrip("\n")
+
+        model_path = self._quantized_model() if self.quantize else self.model_path
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if self.threads:
+            options.intra_op_num_threads = self.threads
+            options.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        if isinstance(model_input.shape[2], int):
+            self.input_height = model_input.shape[2]
+
+        self.loaded = True
+        print(f"ONNX recognizer ready ({os.path.basename(model_path)})")
+
+    def _quantized_model(self):
+        path = os.path.splitext(self.model_path)[0] + ".int8.onnx"
+        if not os.path.exists(path) or os.path.getmtime(path) < os.path.getmtime(self.model_path):
+            from onnxruntime.quantization import quantize_dynamic, QuantType
+            print("Quantizing ONNX recognizer to int8...")
+            quantize_dynamic(self.model_path, path, weight_type=QuantType.QInt8)
+        return path
+
+    def unload(self):
+        self.session = None
+        self.loaded = False
+
+    def detect(self, img):
+        return find_text_boxes(img)
+
+    def split_regions(self, regions):
+        return [[rect] for rect in regions]
+
+    def recognize(self, img, regions):
+        if not regions:
+            return []
+        gray = img if img.ndim == 2 else cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+
+        # Resize every crop to the model height and pad to a common width so
+        # the whole scan is one batched session.run()
+        crops = []
+        for x1, y1, x2, y2 in regions:
+            crop = gray[y1:y2, x1:x2]
+            width = max(1, int(round(crop.shape[1] * self.input_height / crop.shape[0])))
+            crops.append(cv2.resize(crop, (width, self.input_height), interpolation=cv2.INTER_CUBIC))
+        max_width = max(c.shape[1] for c in crops)
+        batch = np.stack([
+            cv2.copyMakeBorder(c, 0, 0, 0, max_width - c.shape[1], cv2.BORDER_REPLICATE) for c in crops
+        ]).astype(np.float32)
+        batch = (batch / 255.0 - 0.5) / 0.5
+
+        logits = self.session.run(None, {self.input_name: batch[:, None, :, :]})[0]
+
+        results = []
+        for rect, seq in zip(regions, logits):
+            text, conf = self._ctc_decode(seq)
+            results.append((_rect_to_points(*rect), text, conf))
+        return results
+
+    def _ctc_decode(self, logits):
+        exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+        probs = exp / exp.sum(axis=1, keepdims=True)
+        best = probs.argmax(axis=1)
+
+        chars = []
+        confs = []
+        prev = 0
+        for t, cls in enumerate(best):
+            if cls != 0 and cls != prev and cls - 1 < len(self.charset):
+                chars.append(self.charset[cls - 1])
+                confs.append(probs[t, cls])
+            prev = cls
+        conf = float(np.mean(confs)) if confs else 0.0
+        return "".join(chars), conf
+
+
+ENGINES = {
+    EasyOCREngine.name: EasyOCREngine,
+    TesseractEngine.name: TesseractEngine,
+    ONNXEngine.name: ONNXEngine,
+}
+
+DEFAULT_ENGINE = EasyOCREngine.name
+
+
+def _engine_worker(conn, name, options):
+    """Child process side of SubprocessEngine: load, then serve calls until told to stop"""
+    try:
+        engine = ENGINES[name](**options)
+        engine.load()
+    except Exception as e:
+        conn.send(("error", e))
+        return
+    conn.send(("ok", engine.describe()))
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+        if message is None:
+            break
+        method, args = message
+        try:
+            conn.send(("ok", getattr(engine, method)(*args)))
+        except Exception as e:
+            conn.send(("error", e))
+
+
+class SubprocessEngine(OCREngine):
+    """Runs another engine in a child process.
+
+    Unloading kills the process, which hands all of the model's memory
+    (torch's allocator included) back to the OS; an in-process unload only
+    drops references. Each detect/recognize call pickles its image across a
+    pipe, a few ms for a tag ROI.
+    """
+    __slots__ = ('name', 'options', '_local', '_description', '_process', '_conn', '_lock')
+
+    def __init__(self, engine, **options):
+        super().__init__(**options)
+        # Same name as the wrapped engine, so caches and fallbacks treat them alike
+        self.name = engine
+        self.options = options
+        # Never loaded here; only used for split_regions()
+        self._local = ENGINES[engine](**options)
+        self._description = None
+        self._process = None
+        self._conn = None
+        self._lock = threading.Lock()
+
+    @property
+    def pid(self):
+        return self._process.pid if self._process is not None else None
+
+    def preload(self):
+        pass
+
+    def load(self):
+        if self.loaded:
+            return
+        import multiprocessing
+        ctx = multiprocessing.get_context("spawn")
+        self._conn, child_conn = ctx.Pipe()
+        self._process = ctx.Process(target=_engine_worker, args=(child_conn, self.name, self.options),
+                                    name=f"OCR-{self.name}", daemon=True)
+        self._process.start()
+        child_conn.close()
+        try:
+            status, payload = self._conn.recv()
+        except EOFError:
+            status, payload = "error", OSError(f"{self.name} subprocess exited while loading")
+        if status == "error":
+            self.unload()
+            raise payload
+        self._description = payload
+        self.loaded = True
+
+    def unload(self):
+        if self._process is not None:
+            try:
+                self._conn.send(None)
+            except (OSError, BrokenPipeError):
+                pass
+            self._process.join(timeout=2)
+            if self._process.is_alive():
+                self._process.terminate()
+            self._conn.close()
+        self._process = None
+        self._conn = None
+        self.loaded = False
+
+    def _call(self, method, *args):
+        with self._lock:
+            try:
+                self._conn.send((method, args))
+                status, payload = self._conn.recv()
+            except (EOFError, OSError):
+                # Child died; the next scan starts a fresh one
+                self.unload()
+                raise OSError(f"{self.name} subprocess exited")
+        if status == "error":
+            raise payload
+        return payload
+
+    def detect(self, img):
+        return self._call("detect", img)
+
+    def recognize(self, img, regions):
+        return self._call("recognize", img, regions)
+
+    def split_regions(self, regions):
+        return self._local.split_regions(regions)
+
+    def describe(self):
+        return f"{self._description or self._local.describe()}, subprocess"
+
+
+def create_engine(name, isolated=False, **options):
+    """isolated=True runs the engine in a child process (see SubprocessEngine)"""
+    if name not in ENGINES:
+        print(f"Unknown OCR engine '{name}', using '{DEFAULT_ENGINE}'")
+        name = DEFAULT_ENGINE
+    if isolated:
+        return SubprocessEngine(name, **options)
+    return ENGINES[name](**options)
@@ -1,4 +1,3 @@
-import requests
 import re
 import json
 import hashlib
@@ -40,6 +39,7 @@ class GameDataFetcher:
             return self.recruit_pool
         
         try:
+            import requests
             print("Fetching data from GitHub...")
             with requests.Session() as session:
                 gacha_res = session.get(GACHA_TABLE_URL, timeout=10).json()
@@ -0,0 +1,80 @@
+from collections import OrderedDict
+import cv2
+import numpy as np
+
+# A difference hash finds "something moved" cheaply, but 1024 bits are too
+# coarse to tell one tag's text from another's. Anything that must not
+# confuse two tag screens also compares thumbnails, which keep the glyphs.
+
+def thumbnail(img, scale=4):
+    """Grayscale 1/scale downsample, averaging every pixel so thin strokes still count"""
+    h, w = img.shape[:2]
+    small = cv2.resize(img, (max(1, w // scale), max(1, h // scale)), interpolation=cv2.INTER_AREA)
+    if small.ndim == 3:
+        small = cv2.cvtColor(small[..., :3], cv2.COLOR_BGR2GRAY)
+    return small
+
+def thumbnail_difference(a, b, block=4):
+    """Largest mean absolute difference over any block x block cell of two thumbnails.
+
+    Changed tag text shows up as a few cells with a large difference;
+    compression noise and slow background animation stay low everywhere.
+    """
+    if a.shape != b.shape:
+        return 255.0
+    diff = cv2.absdiff(a, b)
+    h, w = diff.shape[:2]
+    cells = cv2.resize(diff, (max(1, w // block), max(1, h // block)), interpolation=cv2.INTER_AREA)
+    return float(cells.max())
+
+def fingerprint(img, size=32):
+    """size*size-bit difference hash of an image (or its thumbnail), as an int"""
+    if img.ndim == 3:
+        img = thumbnail(img)
+    cells = cv2.resize(img, (size + 1, size), interpolation=cv2.INTER_AREA).astype(np.int16)
+    bits = (cells[:, 1:] > cells[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+class ScanCache:
+    """Small LRU of frame fingerprint -> scan result.
+
+    With tolerance 0 the fingerprint lookup is a plain dict lookup. A
+    tolerance > 0 accepts near-identical frames (animated backgrounds) at
+    the cost of a linear scan over the few cached entries. Either way a
+    hit is only trusted once the frame's thumbnail matches the cached one
+    within `max_difference`, since different tag text can share a hash.
+    """
+    __slots__ = ('max_entries', 'tolerance', 'max_difference', '_entries', 'hits', 'misses')
+
+    def __init__(self, max_entries=8, tolerance=0, max_difference=12.0):
+        self.max_entries = max_entries
+        self.tolerance = tolerance
+        self.max_difference = max_difference
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, fp, thumb):
+        entry_key = (key, fp)
+        if entry_key not in self._entries and self.tolerance:
+            entry_key = next((k for k in self._entries
+                              if k[0] == key and hamming(k[1], fp) <= self.tolerance), None)
+        entry = self._entries.get(entry_key) if entry_key is not None else None
+        if entry is None or thumbnail_difference(entry[1], thumb) > self.max_difference:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(entry_key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, fp, thumb, value):
+        self._entries[(key, fp)] = (value, thumb)
+        self._entries.move_to_end((key, fp))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
@@ -0,0 +1,98 @@
+import tkinter as tk
+from .metrics import METRICS
+
+def make_click_through(window):
+    """Let mouse clicks pass through a window (Windows only, no-op elsewhere)"""
+    try:
+        import ctypes
+
+        window.update()
+
+        hwnd = ctypes.windll.user32.GetParent(window.winfo_id())
+        GWL_EXSTYLE = -20
+        WS_EX_LAYERED = 0x00080000
+        WS_EX_TRANSPARENT = 0x00000020
+
+        styles = ctypes.windll.user32.GetWindowLongW(hwnd, GWL_EXSTYLE)
+        ctypes.windll.user32.SetWindowLongW(hwnd, GWL_EXSTYLE, styles | WS_EX_LAYERED | WS_EX_TRANSPARENT)
+    except Exception:
+        pass
+
+def border_rects(bbox, padding, border_width):
+    """The four (x, y, w, h) strips framing bbox"""
+    x1, y1, x2, y2 = bbox
+    return [
+        (x1 - padding, y1 - padding, x2 - x1 + 2*padding, border_width),
+        (x1 - padding, y2 + padding - border_width, x2 - x1 + 2*padding, border_width),
+        (x1 - padding, y1 - padding, border_width, y2 - y1 + 2*padding),
+        (x2 + padding - border_width, y1 - padding, border_width, y2 - y1 + 2*padding),
+    ]
+
+class HighlightPool:
+    """Reusable click-through border windows for tag highlights.
+
+    Each highlight is framed by four thin topmost windows. They are created
+    (and made click-through) once, then withdrawn on clear and moved into
+    place on the next show, so a selection costs four geometry changes
+    instead of four window creations and Win32 style calls.
+    """
+    __slots__ = ('root', 'padding', 'border_width', 'colour', 'max_free', 'created',
+                 '_free', '_active')
+
+    def __init__(self, root, padding=10, border_width=4, colour="#00FF00", max_free=24):
+        self.root = root
+        self.padding = padding
+        self.border_width = border_width
+        self.colour = colour
+        self.max_free = max_free
+        # Lifetime window creations, to keep an eye on handle churn
+        self.created = 0
+        self._free = []
+        self._active = []
+
+    def show(self, bbox):
+        with METRICS.span("highlight"):
+            for bx, by, bw, bh in border_rects(bbox, self.padding, self.border_width):
+                border = self._acquire(f"{bw}x{bh}+{bx}+{by}")
+                self._active.append((border, (bx, by, bx + bw, by + bh)))
+
+    def clear(self):
+        """Hide every highlight; returns the screen rects they covered"""
+        rects = []
+        for border, rect in self._active:
+            rects.append(rect)
+            try:
+                if len(self._free) < self.max_free:
+                    border.withdraw()
+                    self._free.append(border)
+                else:
+                    border.destroy()
+            except tk.TclError:
+                pass
+        self._active = []
+        return rects
+
+    def destroy(self):
+        self.clear()
+        for border in self._free:
+            try:
+                border.destroy()
+            except tk.TclError:
+                pass
+        self._free = []
+
+    def _acquire(self, geometry):
+        if self._free:
+            border = self._free.pop()
+            border.geometry(geometry)
+            border.deiconify()
+            border.lift()
+            return border
+        border = tk.Toplevel(self.root)
+        border.overrideredirect(True)
+        border.attributes("-topmost", True)
+        border.geometry(geometry)
+        border.configure(bg=self.colour)
+        make_click_through(border)
+        self.created += 1
+        return border
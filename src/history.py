@@ -0,0 +1,133 @@
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+HISTORY_FILE = Path(__file__).parent.parent / ".scan_history.db"
+MAX_ENTRIES = 100000
+TOP_COMBOS = 5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    tags TEXT NOT NULL,
+    best_min INTEGER NOT NULL,
+    top TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS scan_tags (
+    tag TEXT NOT NULL,
+    scan_id INTEGER NOT NULL REFERENCES scans(id) ON DELETE CASCADE,
+    PRIMARY KEY (tag, scan_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS scans_ts ON scans(ts);
+CREATE INDEX IF NOT EXISTS scans_best ON scans(best_min, id);
+CREATE INDEX IF NOT EXISTS scan_tags_scan ON scan_tags(scan_id);
+"""
+
+class ScanHistory:
+    """Scan history in a local SQLite file.
+
+    Each scan is stored compactly: its tags, the best guaranteed rarity and
+    the top few combos as (tags, min, max) - not the operator lists, which
+    the calculator can rebuild from the tags. Tags get their own indexed
+    table so filtering by tag, date or rarity never reads the whole table,
+    and page() uses keyset pagination (id < before_id) so deep pages cost
+    the same as the first.
+    """
+    __slots__ = ('path', 'max_entries', '_conn', '_since_prune')
+
+    def __init__(self, path=HISTORY_FILE, max_entries=MAX_ENTRIES):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self._since_prune = 0
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(_SCHEMA)
+        self.prune()
+
+    def add(self, tags, results, timestamp=None):
+        """Record one scan; returns its id"""
+        timestamp = timestamp or datetime.now()
+        top = [[r['tags'], r['min'], r['max']] for r in results[:TOP_COMBOS]]
+        best_min = max((r['min'] for r in results), default=0)
+        with self._conn:
+            cur = self._conn.execute(
+                "INSERT INTO scans (ts, tags, best_min, top) VALUES (?, ?, ?, ?)",
+                (timestamp.timestamp(), json.dumps(list(tags)), best_min, json.dumps(top)))
+            scan_id = cur.lastrowid
+            self._conn.executemany("INSERT OR IGNORE INTO scan_tags (tag, scan_id) VALUES (?, ?)",
+                                   [(tag.lower(), scan_id) for tag in tags])
+        self._since_prune += 1
+        if self._since_prune >= 1000:
+            self.prune()
+        return scan_id
+
+    def page(self, before_id=None, limit=100, since=None, until=None, tag=None, min_best=None):
+        """Newest-first entries older than `before_id`, filtered.
+
+        since/until are datetimes, tag is matched case-insensitively and
+        min_best keeps scans whose best guaranteed rarity is at least that.
+        """
+        where, params = self._filters(before_id, since, until, tag, min_best)
+        rows = self._conn.execute(
+            f"SELECT id, ts, tags, best_min, top FROM scans {where} ORDER BY id DESC LIMIT ?",
+            params + [limit]).fetchall()
+        return [_entry(row) for row in rows]
+
+    def count(self, since=None, until=None, tag=None, min_best=None):
+        where, params = self._filters(None, since, until, tag, min_best)
+        return self._conn.execute(f"SELECT COUNT(*) FROM scans {where}", params).fetchone()[0]
+
+    def get(self, scan_id):
+        row = self._conn.execute("SELECT id, ts, tags, best_min, top FROM scans WHERE id = ?",
+                                 (scan_id,)).fetchone()
+        return _entry(row) if row else None
+
+    def prune(self):
+        """Drop the oldest scans beyond max_entries"""
+        self._since_prune = 0
+        with self._conn:
+            self._conn.execute(
+                "DELETE FROM scans WHERE id <= (SELECT id FROM scans ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                (self.max_entries,))
+
+    def clear(self):
+        with self._conn:
+            self._conn.execute("DELETE FROM scans")
+
+    def close(self):
+        self._conn.close()
+
+    @staticmethod
+    def _filters(before_id, since, until, tag, min_best):
+        clauses, params = [], []
+        if before_id is not None:
+            clauses.append("id < ?")
+            params.append(before_id)
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(since.timestamp())
+        if until is not None:
+            clauses.append("ts < ?")
+            params.append(until.timestamp())
+        if tag:
+            clauses.append("id IN (SELECT scan_id FROM scan_tags WHERE tag = ?)")
+            params.append(tag.lower())
+        if min_best:
+            clauses.append("best_min >= ?")
+            params.append(min_best)
+        return ("WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+def _entry(row):
+    scan_id, ts, tags, best_min, top = row
+    return {
+        'id': scan_id,
+        'timestamp': datetime.fromtimestamp(ts),
+        'tags': json.loads(tags),
+        'best_min': best_min,
+        'results': [{'tags': t, 'min': lo, 'max': hi} for t, lo, hi in json.loads(top)],
+    }
@@ -0,0 +1,150 @@
+import re
+from .config import VALID_TAGS
+
+MAX_TAGS = 5
+
+_RE_SPACES = re.compile(r"\s+")
+
+# Two boxes are fragments of one tag when they share a text line and the
+# horizontal gap is under this many line heights. Neighbouring tag buttons
+# sit much further apart than the words inside one button.
+_JOIN_GAP_RATIO = 1.0
+_JOIN_MIN_OVERLAP = 0.5
+
+# Try rapidfuzz first (one vectorised cdist call), fall back to fuzzywuzzy
+try:
+    from rapidfuzz import process, fuzz
+
+    def _score_matrix(texts, choices, score_cutoff):
+        return process.cdist(texts, choices, scorer=fuzz.ratio, score_cutoff=score_cutoff).tolist()
+except ImportError:
+    from fuzzywuzzy import fuzz
+
+    def _score_matrix(texts, choices, score_cutoff):
+        matrix = []
+        for text in texts:
+            row = [fuzz.ratio(text, choice) for choice in choices]
+            matrix.append([s if s >= score_cutoff else 0 for s in row])
+        return matrix
+
+
+def normalize(text):
+    return _RE_SPACES.sub(" ", text.strip().lower())
+
+
+def _union(a, b):
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+
+def _same_line_neighbours(left, right):
+    """True if `right` continues `left` on the same text line"""
+    lh, rh = left[3] - left[1], right[3] - right[1]
+    overlap = min(left[3], right[3]) - max(left[1], right[1])
+    if overlap < _JOIN_MIN_OVERLAP * min(lh, rh):
+        return False
+    gap = right[0] - left[2]
+    return -0.25 * lh <= gap <= _JOIN_GAP_RATIO * max(lh, rh)
+
+
+def _word_spans(text):
+    """(start, end) character offsets of each whitespace-separated word"""
+    return [(m.start(), m.end()) for m in re.finditer(r"\S+", text)]
+
+
+def build_candidates(regions):
+    """Expand OCR regions into match candidates.
+
+    regions: [(rect, text, confidence), ...] with rect = (x1, y1, x2, y2).
+    Returns [(text, units, rect, whole)] where units is a frozenset of
+    (region_index, word_index) pairs the candidate consumes and whole is
+    True for an entire region as read. Candidates are each whole region,
+    adjacent fragments rejoined, and every sub-span of multi-word regions
+    so merged neighbouring tags can be split apart.
+    """
+    texts = [normalize(text) for _, text, _ in regions]
+    words = [_word_spans(text) for text in texts]
+    candidates = []
+
+    for i, (rect, _, _) in enumerate(regions):
+        if not words[i]:
+            continue
+        all_words = frozenset((i, w) for w in range(len(words[i])))
+        candidates.append((texts[i], all_words, rect, True))
+
+        # Sub-spans of a merged region, bbox estimated from character offsets
+        n = len(words[i])
+        if n > 1:
+            x1, y1, x2, y2 = rect
+            per_char = (x2 - x1) / max(1, len(texts[i]))
+            for start in range(n):
+                for end in range(start + 1, n + 1):
+                    if end - start == n:
+                        continue
+                    c_start, c_end = words[i][start][0], words[i][end - 1][1]
+                    span_text = texts[i][c_start:c_end]
+                    if len(span_text) < 2:
+                        continue
+                    span_rect = (int(x1 + c_start * per_char), y1, int(x1 + c_end * per_char), y2)
+                    units = frozenset((i, w) for w in range(start, end))
+                    candidates.append((span_text, units, span_rect, False))
+
+    # Rejoin fragments split across two boxes ("Top" + "Operator")
+    order = sorted(range(len(regions)), key=lambda k: regions[k][0][0])
+    for a in order:
+        for b in order:
+            if a == b or not words[a] or not words[b]:
+                continue
+            if not _same_line_neighbours(regions[a][0], regions[b][0]):
+                continue
+            units = frozenset((a, w) for w in range(len(words[a]))) | \
+                frozenset((b, w) for w in range(len(words[b])))
+            joiner = "" if texts[a].endswith("-") or texts[b].startswith("-") else " "
+            candidates.append((texts[a] + joiner + texts[b], units, _union(regions[a][0], regions[b][0]), False))
+
+    return candidates
+
+
+def match_regions(regions, choices=VALID_TAGS, score_cutoff=70, max_tags=MAX_TAGS):
+    """Map OCR regions to distinct tags with a greedy pass.
+
+    All candidates are scored against all tags in a single batch, then
+    pairs are taken from the highest score down so that every tag and
+    every OCR word is used at most once. A whole region may only take its
+    best-scoring tag: if that tag is already taken (the same tag read
+    twice) the region is dropped rather than matched to a runner-up such
+    as Guard -> Vanguard. Only split and rejoined fragments compete for
+    other tags. Returns a list of (tag, rect, score, matched_text).
+    """
+    if not regions:
+        return []
+
+    candidates = build_candidates(regions)
+    choices_lower = [c.lower() for c in choices]
+    matrix = _score_matrix([c[0] for c in candidates], choices_lower, score_cutoff)
+
+    pairs = []
+    for ci, row in enumerate(matrix):
+        best = max(row)
+        whole = candidates[ci][3]
+        for ti, score in enumerate(row):
+            if score >= score_cutoff and (not whole or score == best):
+                pairs.append((score, len(candidates[ci][1]), ci, ti))
+    # Best score first; on ties prefer the candidate that explains more words
+    pairs.sort(key=lambda p: (p[0], p[1]), reverse=True)
+
+    used_units = set()
+    used_tags = set()
+    matches = []
+    for score, _, ci, ti in pairs:
+        if ti in used_tags:
+            continue
+        text, units, rect, _ = candidates[ci]
+        if units & used_units:
+            continue
+        used_tags.add(ti)
+        used_units |= units
+        matches.append((choices[ti], rect, score, text))
+        if len(matches) >= max_tags:
+            break
+
+    return matches
@@ -0,0 +1,109 @@
+import json
+import math
+import threading
+import time
+from collections import deque
+
+def percentile(values, pct):
+    """Nearest-rank percentile; returns 0.0 for an empty sequence"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+class Histogram:
+    """Rolling window of the last `window` samples plus lifetime count/sum"""
+    __slots__ = ('samples', 'count', 'total', 'last')
+
+    def __init__(self, window=500):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self.last = 0.0
+
+    def observe(self, value):
+        self.samples.append(value)
+        self.count += 1
+        self.total += value
+        self.last = value
+
+    def summary(self):
+        samples = list(self.samples)
+        return {
+            "count": self.count,
+            "last": round(self.last, 3),
+            "mean": round(sum(samples) / len(samples), 3) if samples else 0.0,
+            "p50": round(percentile(samples, 50), 3),
+            "p95": round(percentile(samples, 95), 3),
+            "p99": round(percentile(samples, 99), 3),
+        }
+
+class _Span:
+    __slots__ = ('metrics', 'name', 'start')
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.name, (time.perf_counter() - self.start) * 1000)
+        return False
+
+class Metrics:
+    """Per-stage latency histograms in milliseconds, fed from any thread"""
+    __slots__ = ('window', '_histograms', '_lock')
+
+    def __init__(self, window=500):
+        self.window = window
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def span(self, name):
+        """`with METRICS.span("capture"): ...` records the block's duration"""
+        return _Span(self, name)
+
+    def observe(self, name, ms):
+        with self._lock:
+            hist = self._histograms.get(name)
+            if hist is None:
+                hist = self._histograms[name] = Histogram(self.window)
+            hist.observe(ms)
+
+    def record_timings(self, timings):
+        for name, ms in timings.items():
+            self.observe(name, ms)
+
+    def snapshot(self):
+        with self._lock:
+            return {name: hist.summary() for name, hist in self._histograms.items()}
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def to_json(self):
+        return json.dumps({"unit": "ms", "stages": self.snapshot()}, indent=2, sort_keys=True)
+
+    def to_prometheus(self, prefix="recruit_stage"):
+        """Prometheus text exposition: one summary per stage, in seconds"""
+        lines = [
+            f"# HELP {prefix}_seconds Duration of each scan pipeline stage.",
+            f"# TYPE {prefix}_seconds summary",
+        ]
+        with self._lock:
+            items = [(name, hist.summary(), hist.total) for name, hist in sorted(self._histograms.items())]
+        for name, summary, total in items:
+            label = name.replace("\\", "\\\\").replace('"', '\\"')
+            for q, key in (("0.5", "p50"), ("0.95", "p95"), ("0.99", "p99")):
+                lines.append(f'{prefix}_seconds{{stage="{label}",quantile="{q}"}} {summary[key] / 1000:.6f}')
+            lines.append(f'{prefix}_seconds_sum{{stage="{label}"}} {total / 1000:.6f}')
+            lines.append(f'{prefix}_seconds_count{{stage="{label}"}} {summary["count"]}')
+        return "\n".join(lines) + "\n"
+
+# Shared registry for the whole app
+METRICS = Metrics()
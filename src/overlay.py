@@ -1,31 +1,69 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
-import keyboard
+from tkinter import ttk, messagebox, filedialog
+import threading
 import time
-from datetime import datetime
-from .scanner import ScreenScanner
+from datetime import datetime, timedelta
+from .metrics import METRICS
+from .profiling import phase_or_null
 from .calculator import RecruitCalculator
+from .config import VALID_TAGS
+from .scheduler import ScanScheduler
+from .highlights import HighlightPool
+from .clicker import ClickExecutor
+from .capture import rects_intersect, window_rect
+from .results_view import ResultsView
+from .tooltip import Tooltip, operators_text
+from .history import ScanHistory
+from .residency import ModelResidency, POLICIES
 from .settings import SettingsManager, HOTKEY_OPTIONS
 
+# Only Tk, settings and the calculator are imported before the window is
+# up. The scanner stack (cv2, numpy, PIL, the OCR library) loads on a
+# background thread and the keyboard hook once the main loop is idle;
+# see benchmarks/startup_imports.py for the budget check.
+
 class OverlayApp:
-    def __init__(self, fetcher):
+    def __init__(self, fetcher, profiler=None):
         self.fetcher = fetcher
-        self.pool = self.fetcher.fetch_data()
-        self.calculator = RecruitCalculator(self.pool)
-        self.scanner = ScreenScanner()
+        self.profiler = profiler
+        with phase_or_null(profiler, "fetch_data"):
+            self.pool = self.fetcher.fetch_data()
+        with phase_or_null(profiler, "calculator_build"):
+            self.calculator = RecruitCalculator(self.pool)
         self.settings = SettingsManager()
+        self._scanner = None
+        self._scanner_error = None
+        self._scanner_thread = threading.Thread(target=self._load_scanner, name="ScannerLoader", daemon=True)
+        if profiler:
+            # Normally loaded in the background; cProfile only sees this
+            # thread, so build and load it here so its cost gets its own report
+            with profiler.phase("first_reader"):
+                self._load_scanner()
+                if self._scanner is not None:
+                    self._scanner.warm_up()
+        else:
+            self._scanner_thread.start()
         
         self.tag_positions = {}
-        self.highlight_windows = []
+        self.overlay_capture = None
+        self.residency = None
+        self._stream = None
+        self.current_tags = []
         self.current_results = []
-        self.scan_history = []
-        self.max_history = 100
+        self.current_sort = None
+        self.history = ScanHistory()
         
         self.mouse_listener = None
-        self.tooltip = None
         self.root = tk.Tk()
+        self.tooltip = Tooltip(self.root)
+        self.highlights = HighlightPool(self.root)
+        self.clicker = ClickExecutor()
+        self.scan_scheduler = ScanScheduler(self.root.after, cooldown=(self.settings.get("scanner", "cooldown_ms") or 0) / 1000)
         
+        self.watcher = None
+        self._overlay_rect = None
         self.auto_click_enabled = tk.BooleanVar(value=self.settings.get("features", "auto_click") or False)
+        self.watch_enabled = tk.BooleanVar(value=self.settings.get("watch", "enabled") or False)
         self.min_rarity_filter = tk.IntVar(value=self.settings.get("features", "min_rarity") or 3)
         
         self.root.title("Arknights Recruit Helper")
@@ -52,11 +90,69 @@ class OverlayApp:
                   foreground=[("selected", "white")])
         
         self.setup_ui()
-        self.setup_hotkeys()
+        self.root.bind("<Configure>", self._on_root_configure)
+        self.root.after_idle(self._finish_startup)
         
         print(f"Overlay Started. Press '{self.settings.scan_hotkey}' to Scan, '{self.settings.clear_hotkey}' to Clear.")
 
+    def _load_scanner(self):
+        # Runs on a background thread while the window comes up
+        try:
+            from .scanner import ScreenScanner
+            scanner = ScreenScanner(profile=self.settings.scan_profile, engine=self.settings.ocr_engine,
+                                    engine_options=self.settings.engine_options)
+            scanner.engine.preload()
+            self._scanner = scanner
+        except Exception as e:
+            self._scanner_error = e
+            print(f"Scanner failed to load: {e}")
+    
+    @property
+    def scanner(self):
+        if self._scanner is None:
+            if self._scanner_thread.is_alive():
+                self._scanner_thread.join()
+            if self._scanner is None:
+                raise RuntimeError(f"Scanner unavailable: {self._scanner_error}")
+        return self._scanner
+    
+    def _finish_startup(self):
+        self.setup_hotkeys()
+        self._when_scanner_ready(self._start_residency)
+        if self.settings.get("debug", "enabled") or self.watch_enabled.get():
+            self._when_scanner_ready(self._start_optional_features)
+    
+    def _when_scanner_ready(self, callback):
+        # Poll instead of joining so the UI stays responsive while it loads
+        if self._scanner is None and self._scanner_thread.is_alive():
+            self.root.after(100, self._when_scanner_ready, callback)
+        else:
+            callback()
+    
+    def _start_residency(self):
+        if self._scanner is None:
+            return
+        self.residency = ModelResidency(self._scanner, self.settings.memory_policy, self.settings.idle_minutes)
+        # Reaching for the overlay is the cue to reload an unloaded model
+        self.root.bind("<Enter>", self._on_overlay_enter, add="+")
+        self.root.after(30000, self._check_residency)
+    
+    def _check_residency(self):
+        self.residency.check()
+        self.root.after(30000, self._check_residency)
+    
+    def _on_overlay_enter(self, event=None):
+        if self.residency and not self._scanner.engine.loaded:
+            self.residency.warm_up()
+    
+    def _start_optional_features(self):
+        self.apply_debug_setting()
+        if self.watch_enabled.get():
+            self.start_watch()
+    
     def setup_hotkeys(self):
+        import keyboard
+        
         try:
             keyboard.unhook_all()
         except:
@@ -74,13 +170,13 @@ class OverlayApp:
         quick_key = self.settings.quick_hotkey
         
         if not scan_key.startswith("Mouse"):
-            keyboard.add_hotkey(scan_key, lambda: self.root.after(0, self.perform_scan_sequence))
+            keyboard.add_hotkey(scan_key, self.request_scan)
         
         if not clear_key.startswith("Mouse"):
-            keyboard.add_hotkey(clear_key, lambda: self.root.after(0, self.clear_highlights))
+            keyboard.add_hotkey(clear_key, self.request_clear)
         
         if not quick_key.startswith("Mouse"):
-            keyboard.add_hotkey(quick_key, lambda: self.root.after(0, self.quick_scan))
+            keyboard.add_hotkey(quick_key, self.request_quick_scan)
         
         if scan_key.startswith("Mouse") or clear_key.startswith("Mouse") or quick_key.startswith("Mouse"):
             self._setup_mouse_listener(scan_key, clear_key, quick_key)
@@ -88,6 +184,17 @@ class OverlayApp:
         if hasattr(self, 'header_label'):
             self.header_label.config(text=f"[{scan_key}] Scan  •  [{quick_key}] Quick  •  [{clear_key}] Clear")
     
+    # Input callbacks run on the keyboard/pynput threads; the scheduler
+    # turns bursts of presses into at most one running and one queued scan
+    def request_scan(self):
+        self.scan_scheduler.submit(self.perform_scan_sequence)
+    
+    def request_quick_scan(self):
+        self.scan_scheduler.submit(self.quick_scan)
+    
+    def request_clear(self):
+        self.scan_scheduler.preempt(self.clear_highlights)
+    
     def _setup_mouse_listener(self, scan_key, clear_key, quick_key):
         try:
             from pynput import mouse
@@ -102,11 +209,11 @@ class OverlayApp:
                     
                     if button_name:
                         if button_name == scan_key:
-                            self.root.after(0, self.perform_scan_sequence)
+                            self.request_scan()
                         elif button_name == clear_key:
-                            self.root.after(0, self.clear_highlights)
+                            self.request_clear()
                         elif button_name == quick_key:
-                            self.root.after(0, self.quick_scan)
+                            self.request_quick_scan()
             
             self.mouse_listener = mouse.Listener(on_click=on_click)
             self.mouse_listener.start()
@@ -144,13 +251,13 @@ class OverlayApp:
         btn_frame = tk.Frame(main_frame, bg=bg_dark)
         btn_frame.pack(fill="x", padx=10, pady=5)
         
-        scan_btn = tk.Button(btn_frame, text="🔍 SCAN", command=self.perform_scan_sequence,
+        scan_btn = tk.Button(btn_frame, text="🔍 SCAN", command=self.request_scan,
                             bg=accent, fg="white", activebackground=accent_hover, activeforeground="white",
                             font=("Segoe UI", 10, "bold"), relief="flat", cursor="hand2",
                             width=8, pady=5)
         scan_btn.pack(side="left", padx=3)
         
-        quick_btn = tk.Button(btn_frame, text="⚡ QUICK", command=self.quick_scan,
+        quick_btn = tk.Button(btn_frame, text="⚡ QUICK", command=self.request_quick_scan,
                              bg="#FF9800", fg="white", activebackground="#FFB74D", activeforeground="white",
                              font=("Segoe UI", 10, "bold"), relief="flat", cursor="hand2",
                              width=8, pady=5)
@@ -199,6 +306,18 @@ class OverlayApp:
                                     font=("Segoe UI", 9), cursor="hand2")
         auto_check.pack(side="left", padx=5)
         
+        watch_check = tk.Checkbutton(options_frame1, text="👁 Watch", 
+                                     variable=self.watch_enabled,
+                                     command=self.on_watch_toggle,
+                                     bg=bg_dark, fg="#8BC34A", selectcolor=bg_medium, 
+                                     activebackground=bg_dark, activeforeground="#8BC34A",
+                                     font=("Segoe UI", 9), cursor="hand2")
+        watch_check.pack(side="left", padx=5)
+        
+        self.watch_label = tk.Label(options_frame1, text="", fg=text_dim, bg=bg_dark,
+                                    font=("Segoe UI", 8))
+        self.watch_label.pack(side="right", padx=5)
+        
         options_frame2 = tk.Frame(main_frame, bg=bg_dark)
         options_frame2.pack(fill="x", padx=10, pady=2)
         
@@ -243,6 +362,8 @@ class OverlayApp:
         self.tree.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
         
+        self.results_view = ResultsView(self.tree, self.min_rarity_filter.get())
+        self.tree.bind("<<TreeviewSelect>>", self.on_combo_select)
         self.tree.bind("<Motion>", self.on_tree_hover)
         self.tree.bind("<Leave>", self.hide_tooltip)
         
@@ -262,6 +383,16 @@ class OverlayApp:
                                font=("Segoe UI", 9), relief="flat", cursor="hand2", padx=10)
         history_btn.pack(side="left", padx=2)
         
+        stats_btn = tk.Button(inner_bottom, text="📊", command=self.show_stats,
+                              bg=bg_dark, fg=text_light, activebackground="#2a4a7f",
+                              font=("Segoe UI", 9), relief="flat", cursor="hand2", padx=6)
+        stats_btn.pack(side="left", padx=2)
+        
+        edit_btn = tk.Button(inner_bottom, text="✎ Tags", command=self.edit_tags,
+                             bg=bg_dark, fg=text_light, activebackground="#2a4a7f",
+                             font=("Segoe UI", 9), relief="flat", cursor="hand2", padx=6)
+        edit_btn.pack(side="left", padx=2)
+        
         self.status_var = tk.StringVar(value="Ready • Hover results for operators")
         status_label = tk.Label(inner_bottom, textvariable=self.status_var,
                                fg=text_dim, bg=bg_medium, font=("Segoe UI", 8))
@@ -271,38 +402,114 @@ class OverlayApp:
         self.settings.set(self.auto_click_enabled.get(), "features", "auto_click")
         print(f"Auto-click {'enabled' if self.auto_click_enabled.get() else 'disabled'}")
     
+    def on_watch_toggle(self):
+        enabled = self.watch_enabled.get()
+        self.settings.set(enabled, "watch", "enabled")
+        if enabled:
+            self.start_watch()
+        else:
+            self.stop_watch()
+    
+    def start_watch(self):
+        from .watcher import ScreenWatcher
+        
+        if self.watcher is None:
+            self.watcher = ScreenWatcher(
+                self.scanner,
+                on_change=lambda roi, offset: self.scan_scheduler.submit(
+                    lambda: self.on_watch_change(roi, offset), replace=False),
+                fps=self.settings.get("watch", "fps") or 2.0,
+                cpu_budget=self.settings.get("watch", "cpu_budget") or 2.0,
+                mask_provider=self._own_window_rects,
+            )
+        self.watcher.start()
+        self._update_watch_label()
+        print("Watch mode on")
+    
+    def stop_watch(self):
+        if self.watcher:
+            self.watcher.stop()
+        self.watch_label.config(text="")
+        print("Watch mode off")
+    
+    def _on_root_configure(self, event=None):
+        x, y = self.root.winfo_rootx(), self.root.winfo_rooty()
+        self._overlay_rect = (x, y, x + self.root.winfo_width(), y + self.root.winfo_height())
+    
+    def _own_window_rects(self):
+        # Called from the watcher thread, so only read the cached tuple
+        return [self._overlay_rect] if self._overlay_rect else []
+    
+    def _update_watch_label(self):
+        if not (self.watcher and self.watcher.running):
+            return
+        self.watch_label.config(text=f"idle {self.watcher.idle_cost:.1f}% CPU")
+        self.root.after(2000, self._update_watch_label)
+    
+    def on_watch_change(self, roi, offset):
+        """Watcher saw the tag area change and settle; rescan from its frame"""
+        if not self.watch_enabled.get():
+            return
+        try:
+            tag_data, _ = self.scanner.scan_roi(roi, offset)
+        except Exception as e:
+            print(f"Watch scan failed: {e}")
+            return
+        
+        # Keep the last results on screens without tags
+        if not tag_data or set(tag_data) == set(self.tag_positions):
+            return
+        if len(tag_data) >= 3:
+            self.watcher.remember_tag_screen(roi)
+        
+        self.clear_highlights()
+        self.tag_positions = tag_data
+        self.update_results(list(tag_data.keys()))
+    
     def on_filter_change(self):
         self.settings.set(self.min_rarity_filter.get(), "features", "min_rarity")
+        # Only shows/hides rows already in the view; no recalculation
+        self.hide_tooltip()
+        self.results_view.set_filter(self.min_rarity_filter.get())
         if self.tag_positions:
-            self.update_results(list(self.tag_positions.keys()))
+            self._update_results_status(list(self.tag_positions.keys()))
     
     def quick_scan(self):
         """Scan and automatically click the first/best result"""
-        self.clear_highlights()
+        if self.profiler:
+            with self.profiler.scan_phase():
+                return self._quick_scan()
+        return self._quick_scan()
+    
+    def _quick_scan(self):
+        if self.clicker.busy:
+            # A capture now would also restore the window mid-click
+            self.status_var.set("Still clicking, scan skipped")
+            return
         
-        self.root.withdraw()
-        self.root.update()
-        time.sleep(0.15)
+        capture = self._capture()
+        own_rects = self._release_own_windows()
         
-        print("Quick scan...")
         try:
-            img = self.scanner.capture_screen()
-            tag_data, debug_boxes = self.scanner.scan_for_tags(img)
+            roi, offset = capture.capture(own_rects)
+            with METRICS.span("scan"):
+                tag_data, debug_boxes = self.scanner.scan_roi(roi, offset)
             self.tag_positions = tag_data
             tags = list(tag_data.keys())
         except Exception as e:
             print(f"Scan failed: {e}")
             tags = []
             self.tag_positions = {}
-            self.root.deiconify()
+            capture.restore()
             return
         
         if not tags:
-            self.root.deiconify()
+            capture.restore()
             self.status_var.set("No tags found")
             return
         
-        results = self.calculator.calculate(tags, sort_mode=self.strat_var.get())
+        with METRICS.span("calculate"):
+            results = self.calculator.calculate(tags, sort_mode=self.strat_var.get())
         
         min_rarity = self.min_rarity_filter.get()
         filtered_results = [r for r in results if r['min'] >= min_rarity]
@@ -311,52 +518,32 @@ class OverlayApp:
             filtered_results = results  # Fallback to unfiltered if nothing passes
         
         if not filtered_results:
-            self.root.deiconify()
+            capture.restore()
             self.update_results(tags)
             self.status_var.set("No valid combos found")
             return
         
         best_result = filtered_results[0]
         combo_tags = best_result['tags']
+        self.scanner.confirm_tags(combo_tags)
         
-        try:
-            import pyautogui
-            pyautogui.PAUSE = 0.1
-            
-            for tag in combo_tags:
-                for stored_tag, bbox in self.tag_positions.items():
-                    if stored_tag.lower() == tag.lower():
-                        x1, y1, x2, y2 = bbox
-                        center_x = (x1 + x2) // 2
-                        center_y = (y1 + y2) // 2
-                        print(f"Quick-clicking '{stored_tag}' at ({center_x}, {center_y})")
-                        pyautogui.click(center_x, center_y)
-                        time.sleep(0.12)
-                        break
-            
-        except ImportError:
-            print("Error: pyautogui not installed")
-        except Exception as e:
-            print(f"Quick scan click error: {e}")
+        targets = []
+        for tag in combo_tags:
+            for stored_tag, bbox in self.tag_positions.items():
+                if stored_tag.lower() == tag.lower():
+                    targets.append((stored_tag, bbox))
+                    break
         
-        time.sleep(0.1)
-        self.root.deiconify()
         self.update_results(tags)
-        
         clicked_str = ", ".join(combo_tags)
-        self.status_var.set(f"⚡ Quick: {clicked_str} ({best_result['min']}★-{best_result['max']}★)")
+        # The window stays hidden (if the capture hid it) until the clicks are confirmed
+        self.auto_click_tags(targets, done_text=f"⚡ Quick: {clicked_str} ({best_result['min']}★-{best_result['max']}★)")
     
     def add_to_history(self, tags, results):
-        entry = {
-            'timestamp': datetime.now(),
-            'tags': tags.copy(),
-            'results': results.copy() if results else [],
-            'best_min': max([r['min'] for r in results]) if results else 0
-        }
-        self.scan_history.insert(0, entry)
-        # Keep only last N entries
-        if len(self.scan_history) > self.max_history:
-            self.scan_history = self.scan_history[:self.max_history]
+        try:
+            self.history.add(tags, results)
+        except Exception as e:
+            print(f"Error saving scan history: {e}")
     
     def show_history(self):
         bg_dark = "#1a1a2e"
@@ -364,20 +551,45 @@ class OverlayApp:
         accent = "#e94560"
         text_light = "#eee"
         text_dim = "#888"
+        page_size = 100
         
-        if not self.scan_history:
+        if not self.history.count():
             messagebox.showinfo("History", "No scan history yet!")
             return
         
         history_win = tk.Toplevel(self.root)
         history_win.title("Scan History")
-        history_win.geometry("420x380")
+        history_win.geometry("420x440")
         history_win.configure(bg=bg_dark)
         history_win.attributes("-topmost", True)
         
         tk.Label(history_win, text="📜 SCAN HISTORY", fg=accent, bg=bg_dark,
                 font=("Segoe UI", 12, "bold")).pack(pady=10)
         
+        filter_frame = tk.Frame(history_win, bg=bg_dark)
+        filter_frame.pack(fill="x", padx=15)
+        
+        periods = {"All time": None, "Today": 0, "7 days": 7, "30 days": 30}
+        period_var = tk.StringVar(value="All time")
+        tag_var = tk.StringVar(value="")
+        best_var = tk.IntVar(value=0)
+        
+        ttk.Combobox(filter_frame, textvariable=period_var, values=list(periods),
+                     state="readonly", width=9).pack(side="left", padx=(0, 5))
+        tk.Label(filter_frame, text="Tag:", fg=text_dim, bg=bg_dark,
+                font=("Segoe UI", 9)).pack(side="left")
+        tag_entry = tk.Entry(filter_frame, textvariable=tag_var, bg=bg_medium, fg=text_light,
+                             insertbackground=text_light, relief="flat", width=14)
+        tag_entry.pack(side="left", padx=5)
+        tk.Label(filter_frame, text="Best ≥", fg=text_dim, bg=bg_dark,
+                font=("Segoe UI", 9)).pack(side="left")
+        tk.Spinbox(filter_frame, from_=0, to=6, textvariable=best_var, width=2,
+                   bg=bg_medium, fg=text_light, relief="flat").pack(side="left", padx=5)
+        
+        count_var = tk.StringVar()
+        tk.Label(history_win, textvariable=count_var, fg=text_dim, bg=bg_dark,
+                font=("Segoe UI", 8)).pack(anchor="w", padx=15, pady=(5, 0))
+        
         # Create listbox for history
         list_frame = tk.Frame(history_win, bg=bg_dark)
         list_frame.pack(fill="both", expand=True, padx=15, pady=5)
@@ -386,14 +598,58 @@ class OverlayApp:
                             selectbackground=accent, selectforeground="white",
                             font=("Segoe UI", 10), height=10, relief="flat",
                             highlightthickness=0)
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=listbox.yview)
+        scrollbar.pack(side="right", fill="y")
         listbox.pack(fill="both", expand=True)
         
-        for i, entry in enumerate(self.scan_history):
-            time_str = entry['timestamp'].strftime("%H:%M:%S")
-            tags_str = ", ".join(entry['tags'][:3]) + ("..." if len(entry['tags']) > 3 else "")
-            best = entry['best_min']
-            star_icon = "⭐" if best >= 4 else "  "
-            listbox.insert(tk.END, f"  {time_str}  │  {star_icon}{best}★  │  {tags_str}")
+        # Rows are fetched a page at a time as the list scrolls near its end
+        loaded = []
+        state = {"filters": {}, "exhausted": False}
+        
+        def current_filters():
+            days = periods[period_var.get()]
+            since = None
+            if days is not None:
+                since = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+                since -= timedelta(days=days)
+            try:
+                min_best = best_var.get()
+            except tk.TclError:
+                min_best = 0
+            return {"since": since, "tag": tag_var.get().strip() or None, "min_best": min_best or None}
+        
+        def load_page():
+            if state["exhausted"]:
+                return
+            before = loaded[-1]['id'] if loaded else None
+            entries = self.history.page(before_id=before, limit=page_size, **state["filters"])
+            state["exhausted"] = len(entries) < page_size
+            for entry in entries:
+                time_str = entry['timestamp'].strftime("%m-%d %H:%M:%S")
+                tags_str = ", ".join(entry['tags'][:3]) + ("..." if len(entry['tags']) > 3 else "")
+                best = entry['best_min']
+                star_icon = "⭐" if best >= 4 else "  "
+                listbox.insert(tk.END, f"  {time_str}  │  {star_icon}{best}★  │  {tags_str}")
+            loaded.extend(entries)
+        
+        def on_scroll(first, last):
+            scrollbar.set(first, last)
+            if float(last) >= 0.9:
+                load_page()
+        
+        listbox.configure(yscrollcommand=on_scroll)
+        
+        def reload(*_):
+            state["filters"] = current_filters()
+            state["exhausted"] = False
+            loaded.clear()
+            listbox.delete(0, tk.END)
+            count_var.set(f"{self.history.count(**state['filters'])} scans")
+            load_page()
+        
+        period_var.trace_add("write", reload)
+        best_var.trace_add("write", reload)
+        tag_entry.bind("<Return>", reload)
         
         detail_frame = tk.Frame(history_win, bg=bg_dark)
         detail_frame.pack(fill="x", padx=15, pady=5)
@@ -406,7 +662,7 @@ class OverlayApp:
         def on_select(event):
             sel = listbox.curselection()
             if sel:
-                entry = self.scan_history[sel[0]]
+                entry = loaded[sel[0]]
                 tags_str = ", ".join(entry['tags'])
                 results_str = ""
                 for r in entry['results'][:5]:
@@ -418,13 +674,195 @@ class OverlayApp:
         def load_selected():
             sel = listbox.curselection()
             if sel:
-                entry = self.scan_history[sel[0]]
-                self.update_results(entry['tags'])
+                entry = loaded[sel[0]]
+                self.update_results(entry['tags'], record=False)
                 history_win.destroy()
         
         tk.Button(history_win, text="↩ Load Selected", command=load_selected,
                  bg=accent, fg="white", font=("Segoe UI", 10, "bold"),
                  relief="flat", cursor="hand2", padx=20, pady=5).pack(pady=10)
+        
+        reload()
+    
+    def edit_tags(self):
+        bg_dark = "#1a1a2e"
+        bg_medium = "#16213e"
+        accent = "#e94560"
+        text_light = "#eee"
+        text_dim = "#888"
+        
+        edit_win = tk.Toplevel(self.root)
+        edit_win.title("Edit Tags")
+        edit_win.geometry("300x330")
+        edit_win.configure(bg=bg_dark)
+        edit_win.attributes("-topmost", True)
+        
+        tk.Label(edit_win, text="✎ EDIT TAGS", fg=accent, bg=bg_dark,
+                font=("Segoe UI", 12, "bold")).pack(pady=10)
+        
+        listbox = tk.Listbox(edit_win, bg=bg_medium, fg=text_light,
+                             selectbackground=accent, selectforeground="white",
+                             font=("Segoe UI", 10), height=6, relief="flat",
+                             highlightthickness=0, exportselection=False)
+        listbox.pack(fill="x", padx=15)
+        
+        tag_var = tk.StringVar()
+        tag_box = ttk.Combobox(edit_win, textvariable=tag_var, state="readonly", width=24)
+        tag_box.pack(pady=10)
+        
+        note_var = tk.StringVar(value="Select a tag to replace or remove it")
+        
+        def refresh():
+            listbox.delete(0, tk.END)
+            for tag in self.current_tags:
+                listbox.insert(tk.END, tag)
+            present = {t.lower() for t in self.current_tags}
+            choices = [t for t in VALID_TAGS if t.lower() not in present]
+            tag_box.configure(values=choices)
+            if tag_var.get() not in choices:
+                tag_var.set(choices[0] if choices else "")
+        
+        def selected():
+            sel = listbox.curselection()
+            return self.current_tags[sel[0]] if sel else None
+        
+        def add():
+            if len(self.current_tags) >= 5:
+                note_var.set("The screen shows 5 tags; replace one instead")
+            elif tag_var.get():
+                self.edit_tag(None, tag_var.get())
+                refresh()
+        
+        def replace():
+            old = selected()
+            if old is None:
+                note_var.set("Select the misread tag first")
+            elif tag_var.get():
+                self.edit_tag(old, tag_var.get())
+                refresh()
+        
+        def remove():
+            old = selected()
+            if old is None:
+                note_var.set("Select the tag to remove first")
+            else:
+                self.edit_tag(old, None)
+                refresh()
+        
+        btn_frame = tk.Frame(edit_win, bg=bg_dark)
+        btn_frame.pack()
+        for text, command in (("+ Add", add), ("⇄ Replace", replace), ("− Remove", remove)):
+            tk.Button(btn_frame, text=text, command=command,
+                     bg=bg_medium, fg=text_light, activebackground="#2a4a7f", activeforeground="white",
+                     font=("Segoe UI", 9), relief="flat", cursor="hand2", padx=8).pack(side="left", padx=3)
+        
+        tk.Label(edit_win, textvariable=note_var, fg=text_dim, bg=bg_dark,
+                font=("Segoe UI", 8), wraplength=270).pack(pady=10)
+        
+        refresh()
+    
+    def edit_tag(self, old, new):
+        """Add (old=None), remove (new=None) or replace one tag in the shown results.
+        
+        Only the combos involving the changed tag are recomputed; the rest
+        are reused from the current results.
+        """
+        tags = [t for t in self.current_tags if old is None or t.lower() != old.lower()]
+        sort_mode = self.strat_var.get()
+        
+        with METRICS.span("calculate_edit"):
+            if self.current_sort != sort_mode and self.current_tags:
+                # Shown results were sorted for the other strategy; nothing to reuse
+                results = self.calculator.calculate(tags, sort_mode=sort_mode)
+            elif old is not None:
+                results = self.calculator.without(self.current_results, old)
+            else:
+                results = self.current_results
+            if new is not None:
+                results = self.calculator.extend(results, tags, new, sort_mode=sort_mode)
+                tags.append(new)
+        
+        # A replaced tag is still where the misread one was on screen
+        key = next((t for t in self.tag_positions if old is not None and t.lower() == old.lower()), None)
+        if key is not None:
+            bbox = self.tag_positions.pop(key)
+            if new is not None:
+                self.tag_positions[new] = bbox
+        
+        print(f"Tag edit: {old!r} -> {new!r}")
+        # Corrections only; a scanner that is still loading or failed to load just misses this one
+        if self._scanner is not None:
+            self._scanner.correct_tag(old, new)
+        self.update_results(tags, record=False, results=results)
+    
+    def show_stats(self):
+        bg_dark = "#1a1a2e"
+        bg_medium = "#16213e"
+        accent = "#e94560"
+        text_light = "#eee"
+        
+        stats_win = tk.Toplevel(self.root)
+        stats_win.title("Scan Timings")
+        stats_win.geometry("400x340")
+        stats_win.configure(bg=bg_dark)
+        stats_win.attributes("-topmost", True)
+        
+        tk.Label(stats_win, text="📊 SCAN TIMINGS (ms)", fg=accent, bg=bg_dark,
+                font=("Segoe UI", 12, "bold")).pack(pady=10)
+        
+        table_var = tk.StringVar()
+        tk.Label(stats_win, textvariable=table_var, fg=text_light, bg=bg_medium,
+                font=("Consolas", 9), justify="left", anchor="nw",
+                padx=10, pady=8).pack(fill="both", expand=True, padx=15)
+        
+        # Pipeline order first, anything else after
+        order = ["hide_window", "capture", "crop", "fingerprint", "resize",
+                 "detect", "recognize", "match", "scan", "show_window", "calculate",
+                 "calculate_incremental", "calculate_edit", "render", "first_result", "highlight", "clicks", "total"]
+        
+        def refresh():
+            if not stats_win.winfo_exists():
+                return
+            snapshot = METRICS.snapshot()
+            names = [n for n in order if n in snapshot] + sorted(n for n in snapshot if n not in order)
+            lines = [f"{'stage':<12}{'last':>8}{'p50':>8}{'p95':>8}{'n':>6}"]
+            for name in names:
+                h = snapshot[name]
+                lines.append(f"{name:<12}{h['last']:>8.1f}{h['p50']:>8.1f}{h['p95']:>8.1f}{h['count']:>6}")
+            if not names:
+                lines.append("No scans yet")
+            if self.residency:
+                mem = self.residency.report()
+                rss = f"{mem['rss_mb']:.0f} MB" if mem['rss_mb'] is not None else "n/a"
+                if mem['model_process_mb'] is not None:
+                    rss += f" + {mem['model_process_mb']:.0f} MB model process"
+                state = "loaded" if mem['loaded'] else "unloaded"
+                load = f", load {mem['last_load_ms']:.0f} ms" if mem['last_load_ms'] else ""
+                lines.append("")
+                lines.append(f"memory {rss}, model {state} ({mem['policy']}{load})")
+            table_var.set("\n".join(lines))
+            stats_win.after(1000, refresh)
+        
+        def export(fmt):
+            ext = ".prom" if fmt == "prometheus" else ".json"
+            path = filedialog.asksaveasfilename(parent=stats_win, title="Export timings",
+                                                defaultextension=ext, initialfile=f"scan_metrics{ext}")
+            if path:
+                text = METRICS.to_prometheus() if fmt == "prometheus" else METRICS.to_json()
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(text)
+        
+        btn_frame = tk.Frame(stats_win, bg=bg_dark)
+        btn_frame.pack(pady=10)
+        for label, fmt in (("Prometheus", "prometheus"), ("JSON", "json")):
+            tk.Button(btn_frame, text=f"⇪ {label}", command=lambda f=fmt: export(f),
+                     bg=bg_medium, fg=text_light, font=("Segoe UI", 9),
+                     relief="flat", cursor="hand2", padx=10).pack(side="left", padx=5)
+        tk.Button(btn_frame, text="Reset", command=METRICS.reset,
+                 bg=bg_medium, fg=text_light, font=("Segoe UI", 9),
+                 relief="flat", cursor="hand2", padx=10).pack(side="left", padx=5)
+        
+        refresh()
     
     def copy_results(self):
         if not self.current_results:
@@ -449,82 +887,50 @@ class OverlayApp:
         self.status_var.set("Results copied to clipboard!")
     
     def on_tree_hover(self, event):
+        # Fires on every motion event; nothing below runs while the row is unchanged
         item = self.tree.identify_row(event.y)
-        if not item:
-            self.hide_tooltip()
+        if item and item == self.tooltip.key:
             return
         
-        values = self.tree.item(item)['values']
-        if not values or values[0] in ["No Tags Found", "No Valid Combos"]:
+        result = self.results_view.result_for(item) if item else None
+        if not result or not result['ops']:
             self.hide_tooltip()
             return
         
-        tag_str = values[0]
-        
-        for res in self.current_results:
-            if ", ".join(res['tags']) == tag_str:
-                operators = res['ops']
-                if operators:
-                    self.show_tooltip(event, operators)
-                return
-        
-        self.hide_tooltip()
-    
-    def show_tooltip(self, event, operators):
-        if self.tooltip:
-            self.tooltip.destroy()
-        
-        op_lines = []
-        for op in operators[:10]:
-            rarity = op['rarity']
-            name = op['name']
-            if rarity >= 5:
-                op_lines.append(f"  ⭐ {rarity}★ {name}")
-            elif rarity >= 4:
-                op_lines.append(f"  ✦ {rarity}★ {name}")
-            else:
-                op_lines.append(f"     {rarity}★ {name}")
-        
-        if len(operators) > 10:
-            op_lines.append(f"  ... +{len(operators) - 10} more")
-        
-        op_text = "OPERATORS\n" + "\n".join(op_lines)
-        
-        self.tooltip = tk.Toplevel(self.root)
-        self.tooltip.wm_overrideredirect(True)
-        self.tooltip.attributes("-topmost", True)
-        
         x = self.root.winfo_rootx() + event.x + 20
         y = self.root.winfo_rooty() + event.y + 10
-        self.tooltip.geometry(f"+{x}+{y}")
-        
-        frame = tk.Frame(self.tooltip, bg="#0f3460", highlightbackground="#e94560", 
-                        highlightthickness=1)
-        frame.pack()
-        
-        label = tk.Label(frame, text=op_text, bg="#0f3460", fg="#eee",
-                        font=("Segoe UI", 9), justify="left", padx=10, pady=8)
-        label.pack()
+        self.tooltip.show(item, operators_text(result['ops']), x, y)
     
     def hide_tooltip(self, event=None):
-        if self.tooltip:
-            self.tooltip.destroy()
-            self.tooltip = None
+        self.tooltip.hide()
 
     def perform_scan_sequence(self):
         """
-        Hides window, takes screenshot, shows window, processes data.
+        Captures the tag area (hiding the window only if it covers it), processes data.
         """
-        self.clear_highlights()
+        if self.profiler:
+            with self.profiler.scan_phase():
+                return self._perform_scan_sequence()
+        return self._perform_scan_sequence()
+    
+    def _perform_scan_sequence(self):
+        if self.clicker.busy:
+            # A capture now would also restore the window mid-click
+            self.status_var.set("Still clicking, scan skipped")
+            return
+        
+        capture = self._capture()
+        own_rects = self._release_own_windows()
+        scan_start = time.perf_counter()
+        self._stream = {"start": scan_start, "tags": [], "results": []}
         
-        self.root.withdraw()
-        self.root.update()
-        time.sleep(0.15) 
-
-        print("Snapshot taken...")
         try:
-            img = self.scanner.capture_screen()
-            tag_data, debug_boxes = self.scanner.scan_for_tags(img)
+            roi, offset = capture.capture(own_rects)
+            # Back on screen before OCR so tags and combos show up as they're read
+            capture.restore()
+            self.status_var.set("Reading tags...")
+            with METRICS.span("scan"):
+                tag_data, debug_boxes = self.scanner.scan_roi(roi, offset, on_tag=self._on_tag_found)
             self.tag_positions = tag_data
             tags = list(tag_data.keys())
         except Exception as e:
@@ -534,71 +940,81 @@ class OverlayApp:
             tags = []
             self.tag_positions = {}
         
-        self.root.deiconify()
+        capture.restore()
+        stream, self._stream = self._stream, None
+        if tags and set(stream["tags"]) == set(tags):
+            # Every tag arrived mid-scan; the combos are already computed
+            self.update_results(stream["tags"], results=stream["results"])
+        else:
+            self.update_results(tags)
+        METRICS.observe("total", (time.perf_counter() - scan_start) * 1000)
+    
+    def _on_tag_found(self, tag, bbox):
+        """Called by the scanner for each tag as soon as it is matched"""
+        stream = self._stream
+        with METRICS.span("calculate_incremental"):
+            stream["results"] = self.calculator.extend(stream["results"], stream["tags"], tag,
+                                                       sort_mode=self.strat_var.get())
+        stream["tags"].append(tag)
         
-        self.update_results(tags)
+        self.hide_tooltip()
+        self.tags_label.config(text=" • ".join(stream["tags"]))
+        self.results_view.render(stream["results"], self.min_rarity_filter.get())
+        self.status_var.set(f"Reading tags... {len(stream['tags'])} so far")
+        if len(stream["tags"]) == 1:
+            METRICS.observe("first_result", (time.perf_counter() - stream["start"]) * 1000)
+        # The scan still holds the UI thread; repaint now rather than at the end
+        self.root.update_idletasks()
 
-    def update_results(self, tags):
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-        
+    def update_results(self, tags, record=True, results=None):
         if not tags:
-            print("No tags found.")
-            self.tree.insert("", "end", values=("No Tags Found", "-", "-"))
+            self.current_tags = []
+            self.current_results = []
+            self.results_view.clear()
+            self.results_view.show_message("No Tags Found")
             self.tags_label.config(text="")
             self.status_var.set("No tags detected")
             return
 
-        print(f"Processing Tags: {tags}")
-        
         self.tags_label.config(text=" • ".join(tags))
         
-        results = self.calculator.calculate(tags, sort_mode=self.strat_var.get())
+        if results is None:
+            with METRICS.span("calculate"):
+                results = self.calculator.calculate(tags, sort_mode=self.strat_var.get())
         
-        print(f"Calculator returned {len(results)} combos")
+        self._debug_log("calculator returned %d combos for %s", len(results), tags)
         for r in results[:5]:
-            print(f"  {r['tags']} -> {r['min']}*-{r['max']}*")
+            self._debug_log("  %s -> %d*-%d*", r['tags'], r['min'], r['max'])
         
+        self.current_tags = list(tags)
         self.current_results = results
+        self.current_sort = self.strat_var.get()
+        if record:
+            self.add_to_history(tags, results)
         
-        min_rarity = self.min_rarity_filter.get()
-        filtered_results = [r for r in results if r['min'] >= min_rarity]
-        
-        self.add_to_history(tags, results)
+        render_start = time.perf_counter()
+        self.hide_tooltip()
+        self.results_view.render(results, self.min_rarity_filter.get())
+        self._update_results_status(tags)
+        METRICS.observe("render", (time.perf_counter() - render_start) * 1000)
+    
+    def _update_results_status(self, tags):
+        results = self.current_results
+        min_rarity = self.results_view.min_rarity
+        shown = self.results_view.visible_count
         
-        if not filtered_results:
+        if not shown:
             if results:
-                self.tree.insert("", "end", values=(f"No {min_rarity}★+ combos (lower filter)", "-", "-"))
+                self.results_view.show_message(f"No {min_rarity}★+ combos (lower filter)")
                 self.status_var.set(f"Found {len(tags)} tags, {len(results)} combos (filtered: 0)")
             else:
-                self.tree.insert("", "end", values=("No Valid Combos", "-", "-"))
+                self.results_view.show_message("No Valid Combos")
                 self.status_var.set(f"Scanned {len(tags)} tags - no combos")
             return
 
         self.root.title(f"Found: {len(tags)} Tags")
         filter_note = f" (showing {min_rarity}★+)" if min_rarity > 3 else ""
-        self.status_var.set(f"Found {len(tags)} tags, {len(filtered_results)}/{len(results)} combos{filter_note}")
-        
-        for res in filtered_results:
-            tag_str = ", ".join(res['tags'])
-            min_r = res['min']
-            max_r = res['max']
-            
-            # Color code based on rarity
-            if min_r >= 5:
-                tag_name = "gold"  # 5* guaranteed
-            elif min_r >= 4:
-                tag_name = "purple"  # 4* guaranteed
-            else:
-                tag_name = "normal"
-            
-            row_id = self.tree.insert("", "end", values=(tag_str, f"{min_r}*", f"{max_r}*"), tags=(tag_name,))
-        
-        self.tree.tag_configure("gold", foreground="#FFD700", font=('Segoe UI', 10, 'bold'))
-        self.tree.tag_configure("purple", foreground="#DDA0DD")
-        self.tree.tag_configure("normal", foreground="#eee")
-        
-        self.tree.bind("<<TreeviewSelect>>", self.on_combo_select)
+        self.status_var.set(f"Found {len(tags)} tags, {shown}/{len(results)} combos{filter_note}")
     
     def on_combo_select(self, event):
         self.clear_highlights()
@@ -607,13 +1023,11 @@ class OverlayApp:
         if not selection:
             return
         
-        item = self.tree.item(selection[0])
-        tag_str = item['values'][0]
-        
-        if tag_str in ["No Tags Found", "No Valid Combos"]:
+        result = self.results_view.result_for(selection[0])
+        if result is None:
             return
         
-        combo_tags = [t.strip() for t in tag_str.split(",")]
+        combo_tags = result['tags']
         
         tags_to_process = []
         for tag in combo_tags:
@@ -622,6 +1036,9 @@ class OverlayApp:
                     tags_to_process.append((stored_tag, bbox))
                     break
         
+        if self._scanner is not None:
+            self._scanner.confirm_tags([tag_name for tag_name, _ in tags_to_process])
+        
         if self.auto_click_enabled.get() and tags_to_process:
             self.auto_click_tags(tags_to_process)
         else:
@@ -629,101 +1046,127 @@ class OverlayApp:
             for tag_name, bbox in tags_to_process:
                 self.create_highlight(bbox, tag_name)
     
-    def auto_click_tags(self, tags_to_process):
-        try:
-            import pyautogui
-            pyautogui.PAUSE = 0.1
-            
-            self.root.withdraw()
-            self.root.update()
-            time.sleep(0.1)
-            
-            for tag_name, bbox in tags_to_process:
-                x1, y1, x2, y2 = bbox
-                center_x = (x1 + x2) // 2
-                center_y = (y1 + y2) // 2
-                
-                print(f"Auto-clicking '{tag_name}' at ({center_x}, {center_y})")
-                pyautogui.click(center_x, center_y)
-                time.sleep(0.15)
-            
-            time.sleep(0.1)
-            self.root.deiconify()
-            self.status_var.set(f"✓ Clicked {len(tags_to_process)} tags")
-                
-        except ImportError:
-            print("Error: pyautogui not installed. Install with: pip install pyautogui")
-            for tag_name, bbox in tags_to_process:
-                self.create_highlight(bbox, tag_name)
-        except Exception as e:
-            print(f"Auto-click error: {e}")
-            self.root.deiconify()
-            for tag_name, bbox in tags_to_process:
-                self.create_highlight(bbox, tag_name)
+    def auto_click_tags(self, tags_to_process, done_text=None):
+        """Click the tags on the executor thread; the UI stays responsive meanwhile"""
+        capture = self._capture()
+        own_rect = window_rect(self.root)
+        if any(rects_intersect(own_rect, bbox) for _, bbox in tags_to_process):
+            capture.hide()
+        self.hide_tooltip()
+        
+        for tag_name, bbox in tags_to_process:
+            self._debug_log("auto-click '%s' at (%d, %d)", tag_name, (bbox[0] + bbox[2]) // 2, (bbox[1] + bbox[3]) // 2)
+        
+        on_done = lambda result: self.root.after(0, self._on_clicks_done, result, tags_to_process, done_text)
+        if not self.clicker.run(tags_to_process, on_done):
+            capture.restore()
+            self.status_var.set("Still clicking the previous tags")
     
-    def create_highlight(self, bbox, tag_name):
-        x1, y1, x2, y2 = bbox
-        padding = 10
-        border_width = 4
-        
-        borders = [
-            (x1 - padding, y1 - padding, x2 - x1 + 2*padding, border_width),
-            (x1 - padding, y2 + padding - border_width, x2 - x1 + 2*padding, border_width),
-            (x1 - padding, y1 - padding, border_width, y2 - y1 + 2*padding),
-            (x2 + padding - border_width, y1 - padding, border_width, y2 - y1 + 2*padding),
-        ]
-        
-        for (bx, by, bw, bh) in borders:
-            border = tk.Toplevel(self.root)
-            border.overrideredirect(True)
-            border.attributes("-topmost", True)
-            border.geometry(f"{bw}x{bh}+{bx}+{by}")
-            border.configure(bg="#00FF00")
-            
-            self._make_click_through(border)
-            
-            self.highlight_windows.append(border)
+    def _on_clicks_done(self, result, tags_to_process, done_text):
+        self._capture().restore()
+        METRICS.observe("clicks", result["ms"])
+        
+        if result["failed"] is None:
+            self.status_var.set(done_text or f"✓ Clicked {len(result['clicked'])} tags")
+            return
+        
+        if result["error"]:
+            print(f"Auto-click error: {result['error']}")
+            if "pyautogui" in result["error"]:
+                print("Install with: pip install pyautogui")
+        else:
+            print(f"Auto-click: '{result['failed']}' didn't respond, stopped")
+        self.status_var.set(f"Clicked {len(result['clicked'])}/{len(tags_to_process)} tags, "
+                            f"'{result['failed']}' didn't register")
+        # Show the rest so they can be clicked by hand
+        for tag_name, bbox in tags_to_process[len(result['clicked']):]:
+            self.create_highlight(bbox, tag_name)
     
-    def _make_click_through(self, window):
-        try:
-            import ctypes
-            from ctypes import wintypes
-            
-            window.update()
-            
-            hwnd = ctypes.windll.user32.GetParent(window.winfo_id())
-            GWL_EXSTYLE = -20
-            WS_EX_LAYERED = 0x00080000
-            WS_EX_TRANSPARENT = 0x00000020
-            
-            styles = ctypes.windll.user32.GetWindowLongW(hwnd, GWL_EXSTYLE)
-            ctypes.windll.user32.SetWindowLongW(hwnd, GWL_EXSTYLE, styles | WS_EX_LAYERED | WS_EX_TRANSPARENT)
-        except Exception:
-            pass
+    def create_highlight(self, bbox, tag_name):
+        self.highlights.show(bbox)
     
     def clear_highlights(self):
-        for hw in self.highlight_windows:
-            try:
-                hw.destroy()
-            except:
-                pass
-        self.highlight_windows = []
+        """Hide the highlight borders; returns the screen rects they covered"""
+        return self.highlights.clear()
+    
+    def _capture(self):
+        if self.overlay_capture is None:
+            from .capture import OverlayCapture
+            self.overlay_capture = OverlayCapture(self.scanner, self.root)
+        return self.overlay_capture
+    
+    def _release_own_windows(self):
+        """Close highlights and the tooltip before a capture.
+        
+        Their windows may still be on screen for a frame, so the rects they
+        covered are returned for the capture to blank.
+        """
+        rects = self.clear_highlights()
+        if self.tooltip.visible:
+            rects.append(self.tooltip.rect())
+            self.hide_tooltip()
+        return rects
+    
+    def _debug_log(self, message, *args):
+        # Per-scan detail only goes to the debug log, and only while recording.
+        # _scanner, not scanner: this must never wait for the model to load
+        debug = self._scanner.debug if self._scanner is not None else None
+        if debug:
+            debug.log(message, *args)
     
     def open_settings(self):
-        SettingsDialog(self.root, self.settings, self.on_settings_saved)
+        # Not self.scanner: the dialog must open while the model is still loading
+        SettingsDialog(self.root, self.settings, self.on_settings_saved, scanner=self._scanner,
+                       on_dump_debug=self.dump_debug)
+    
+    def apply_debug_setting(self):
+        from .debug import DebugRecorder
+        
+        enabled = bool(self.settings.get("debug", "enabled"))
+        if enabled and self.scanner.debug is None:
+            self.scanner.debug = DebugRecorder(
+                ring_size=self.settings.get("debug", "ring_size") or 20,
+                max_bytes=(self.settings.get("debug", "log_max_kb") or 1024) * 1024,
+            )
+            print("Debug recording on")
+        elif not enabled and self.scanner.debug is not None:
+            self.scanner.debug.close()
+            self.scanner.debug = None
+            print("Debug recording off")
+    
+    def dump_debug(self):
+        if self._scanner is None or self._scanner.debug is None:
+            self.status_var.set("Debug recording is off (⚙ Settings)")
+            return
+        done = lambda path, count: self.root.after(0, self.status_var.set, f"Dumped {count} scans to {path.name}")
+        self.scanner.debug.dump(on_done=done)
     
     def on_settings_saved(self):
         self.setup_hotkeys()
+        # The loader may have read the old settings; apply them once it's done
+        self._when_scanner_ready(self._apply_scanner_settings)
+        if self.residency:
+            self.residency.policy = self.settings.memory_policy
+            self.residency.idle_minutes = self.settings.idle_minutes
         print(f"Hotkeys updated: Scan={self.settings.scan_hotkey}, Clear={self.settings.clear_hotkey}")
+    
+    def _apply_scanner_settings(self):
+        if self._scanner is None:
+            return
+        self.apply_debug_setting()
+        self._scanner.set_profile(self.settings.scan_profile)
+        self._scanner.set_engine(self.settings.ocr_engine, self.settings.engine_options)
 
     def run(self):
         self.root.mainloop()
 
 
 class SettingsDialog:
-    def __init__(self, parent, settings, on_save_callback=None):
+    def __init__(self, parent, settings, on_save_callback=None, scanner=None, on_dump_debug=None):
         self.settings = settings
         self.on_save_callback = on_save_callback
+        self.scanner = scanner
+        self.on_dump_debug = on_dump_debug
         self.bg_dark = "#1a1a2e"
         self.bg_medium = "#16213e"
         self.accent = "#e94560"
@@ -733,8 +1176,8 @@ class SettingsDialog:
         # Create dialog window
         self.dialog = tk.Toplevel(parent)
         self.dialog.title("Settings")
-        self.dialog.geometry("380x380")
-        self.dialog.configure(bg=bg_dark)
+        self.dialog.geometry("380x630")
+        self.dialog.configure(bg=self.bg_dark)
         self.dialog.attributes("-topmost", True)
         self.dialog.resizable(False, False)
         self.dialog.transient(parent)
@@ -748,6 +1191,9 @@ class SettingsDialog:
         self.dialog.geometry(f"+{x}+{y}")
     
     def setup_ui(self):
+        from .preprocess import PROFILES
+        from .engines import ENGINES
+        
         bg_dark = "#1a1a2e"
         bg_medium = "#16213e"
         accent = "#e94560"
@@ -804,6 +1250,88 @@ class SettingsDialog:
                                       font=("Segoe UI", 9), cursor="hand2")
         quick_capture_btn.pack(side="left", padx=5)
         
+        scanner_frame = tk.LabelFrame(self.dialog, text=" Scanner ", fg=text_light, bg=bg_dark,
+                                      font=("Segoe UI", 10, "bold"))
+        scanner_frame.pack(fill="x", padx=20, pady=5)
+        
+        profile_frame = tk.Frame(scanner_frame, bg=bg_dark)
+        profile_frame.pack(fill="x", padx=10, pady=8)
+        
+        tk.Label(profile_frame, text="OCR Profile:", fg=text_light, bg=bg_dark, 
+                width=14, anchor="w", font=("Segoe UI", 10)).pack(side="left")
+        self.profile_var = tk.StringVar(value=self.settings.scan_profile)
+        profile_combo = ttk.Combobox(profile_frame, textvariable=self.profile_var, values=list(PROFILES),
+                                     width=12, state="readonly")
+        profile_combo.pack(side="left", padx=5)
+        
+        engine_frame = tk.Frame(scanner_frame, bg=bg_dark)
+        engine_frame.pack(fill="x", padx=10, pady=(0, 8))
+        
+        tk.Label(engine_frame, text="OCR Engine:", fg=text_light, bg=bg_dark, 
+                width=14, anchor="w", font=("Segoe UI", 10)).pack(side="left")
+        self.engine_var = tk.StringVar(value=self.settings.ocr_engine)
+        engine_combo = ttk.Combobox(engine_frame, textvariable=self.engine_var, values=list(ENGINES),
+                                    width=12, state="readonly")
+        engine_combo.pack(side="left", padx=5)
+        
+        cpu_frame = tk.Frame(scanner_frame, bg=bg_dark)
+        cpu_frame.pack(fill="x", padx=10, pady=(0, 8))
+        
+        tk.Label(cpu_frame, text="CPU Threads:", fg=text_light, bg=bg_dark, 
+                width=14, anchor="w", font=("Segoe UI", 10)).pack(side="left")
+        self.threads_var = tk.IntVar(value=self.settings.get("scanner", "threads") or 0)
+        tk.Spinbox(cpu_frame, from_=0, to=16, textvariable=self.threads_var, width=4,
+                   bg=bg_medium, fg=text_light, buttonbackground=bg_medium,
+                   relief="flat").pack(side="left", padx=5)
+        
+        self.quantize_var = tk.BooleanVar(value=bool(self.settings.get("scanner", "quantize")))
+        tk.Checkbutton(cpu_frame, text="int8", variable=self.quantize_var,
+                       bg=bg_dark, fg=text_light, selectcolor=bg_medium,
+                       activebackground=bg_dark, font=("Segoe UI", 9)).pack(side="left", padx=3)
+        
+        self.small_input_var = tk.BooleanVar(value=bool(self.settings.get("scanner", "small_input")))
+        tk.Checkbutton(cpu_frame, text="Small input", variable=self.small_input_var,
+                       bg=bg_dark, fg=text_light, selectcolor=bg_medium,
+                       activebackground=bg_dark, font=("Segoe UI", 9)).pack(side="left", padx=3)
+        
+        memory_frame = tk.Frame(scanner_frame, bg=bg_dark)
+        memory_frame.pack(fill="x", padx=10, pady=(0, 8))
+        
+        tk.Label(memory_frame, text="Model Memory:", fg=text_light, bg=bg_dark, 
+                width=14, anchor="w", font=("Segoe UI", 10)).pack(side="left")
+        self.memory_var = tk.StringVar(value=self.settings.memory_policy)
+        ttk.Combobox(memory_frame, textvariable=self.memory_var, values=list(POLICIES),
+                     width=12, state="readonly").pack(side="left", padx=5)
+        self.idle_var = tk.IntVar(value=self.settings.idle_minutes)
+        tk.Spinbox(memory_frame, from_=1, to=240, textvariable=self.idle_var, width=4,
+                   bg=bg_medium, fg=text_light, buttonbackground=bg_medium,
+                   relief="flat").pack(side="left", padx=5)
+        tk.Label(memory_frame, text="idle min", fg=text_dim, bg=bg_dark,
+                font=("Segoe UI", 9)).pack(side="left")
+        
+        if self.scanner:
+            alias_frame = tk.Frame(scanner_frame, bg=bg_dark)
+            alias_frame.pack(fill="x", padx=10, pady=(0, 8))
+            
+            stats = self.scanner.corrections.stats()
+            tk.Label(alias_frame, text=f"Learned aliases: {stats['entries']} ({stats['hit_rate']:.0%} hits)",
+                    fg=text_dim, bg=bg_dark, font=("Segoe UI", 9)).pack(side="left")
+            tk.Button(alias_frame, text="⇪ Export", command=self.export_aliases,
+                     bg=bg_medium, fg=text_light, relief="flat",
+                     font=("Segoe UI", 9), cursor="hand2").pack(side="right", padx=5)
+        
+        debug_frame = tk.Frame(scanner_frame, bg=bg_dark)
+        debug_frame.pack(fill="x", padx=10, pady=(0, 8))
+        
+        self.debug_var = tk.BooleanVar(value=bool(self.settings.get("debug", "enabled")))
+        tk.Checkbutton(debug_frame, text="Record debug log", variable=self.debug_var,
+                       bg=bg_dark, fg=text_light, selectcolor=bg_medium,
+                       activebackground=bg_dark, font=("Segoe UI", 9)).pack(side="left")
+        if self.on_dump_debug:
+            tk.Button(debug_frame, text="🐞 Dump", command=self.on_dump_debug,
+                     bg=bg_medium, fg=text_light, relief="flat",
+                     font=("Segoe UI", 9), cursor="hand2").pack(side="right", padx=5)
+        
         info_label = tk.Label(self.dialog, 
                              text="💡 Mouse4/Mouse5 = Side buttons\n    Click 'Capture' then press any key",
                              fg=text_dim, bg=bg_dark, font=("Segoe UI", 9), justify="left")
@@ -823,6 +1351,8 @@ class SettingsDialog:
         cancel_btn.pack(side="right", padx=10)
     
     def capture_hotkey(self, target):
+        import keyboard
+        
         bg_dark = "#1a1a2e"
         accent = "#e94560"
         text_light = "#eee"
@@ -889,6 +1419,14 @@ class SettingsDialog:
             elif target == "quick":
                 self.quick_var.set(captured_key[0])
     
+    def export_aliases(self):
+        path = filedialog.asksaveasfilename(parent=self.dialog, title="Export OCR aliases",
+                                            defaultextension=".json", initialfile="ocr_aliases.json",
+                                            filetypes=[("JSON", "*.json")])
+        if path:
+            count = self.scanner.corrections.export(path)
+            messagebox.showinfo("Export", f"Exported {count} aliases", parent=self.dialog)
+    
     def save_settings(self):
         scan_key = self.scan_var.get()
         clear_key = self.clear_var.get()
@@ -906,6 +1444,20 @@ class SettingsDialog:
         self.settings.scan_hotkey = scan_key
         self.settings.clear_hotkey = clear_key
         self.settings.quick_hotkey = quick_key
+        self.settings.scan_profile = self.profile_var.get()
+        self.settings.ocr_engine = self.engine_var.get()
+        try:
+            self.settings.set(max(0, int(self.threads_var.get())), "scanner", "threads")
+        except (tk.TclError, ValueError):
+            pass
+        self.settings.set(self.quantize_var.get(), "scanner", "quantize")
+        self.settings.set(self.small_input_var.get(), "scanner", "small_input")
+        self.settings.set(self.memory_var.get(), "memory", "policy")
+        try:
+            self.settings.set(max(1, int(self.idle_var.get())), "memory", "idle_minutes")
+        except (tk.TclError, ValueError):
+            pass
+        self.settings.set(self.debug_var.get(), "debug", "enabled")
         
         if self.on_save_callback:
             self.on_save_callback()
@@ -0,0 +1,50 @@
+import time
+from .calculator import RecruitCalculator
+from .scanner import ScreenScanner
+
+class RecruitPipeline:
+    """Scan + calculate without any UI, for the batch CLI and other headless users"""
+    __slots__ = ('scanner', 'calculator')
+
+    def __init__(self, pool, scanner=None, **scanner_options):
+        self.scanner = scanner if scanner is not None else ScreenScanner(**scanner_options)
+        self.calculator = RecruitCalculator(pool)
+
+    def warm_up(self):
+        self.scanner.warm_up()
+
+    def process(self, img, sort_mode="min", top=10):
+        """Full screenshot in, JSON-serialisable result dict out"""
+        start = time.perf_counter()
+        tag_data, _ = self.scanner.scan_for_tags(img)
+        scan_done = time.perf_counter()
+        result = self.calculate(list(tag_data.keys()), sort_mode=sort_mode, top=top)
+        end = time.perf_counter()
+
+        timings = {stage: round(ms, 3) for stage, ms in self.scanner.last_timings.items()}
+        timings["scan"] = round((scan_done - start) * 1000, 3)
+        timings["total"] = round((end - start) * 1000, 3)
+        timings.update(result.pop("timings"))
+
+        result["bboxes"] = {tag: list(bbox) for tag, bbox in tag_data.items()}
+        result["timings"] = timings
+        return result
+
+    def calculate(self, tags, sort_mode="min", top=10):
+        start = time.perf_counter()
+        results = self.calculator.calculate(tags, sort_mode=sort_mode)
+        elapsed = (time.perf_counter() - start) * 1000
+        return {
+            "tags": list(tags),
+            "combos": [serialize_combo(r) for r in (results[:top] if top else results)],
+            "combo_count": len(results),
+            "timings": {"calculate": round(elapsed, 3)},
+        }
+
+def serialize_combo(result):
+    return {
+        "tags": result['tags'],
+        "min": result['min'],
+        "max": result['max'],
+        "operators": [{"name": op['name'], "rarity": op['rarity']} for op in result['ops']],
+    }
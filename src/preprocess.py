@@ -0,0 +1,105 @@
+import cv2
+import numpy as np
+
+# Each step takes an image and returns (image, scale) where scale is the
+# factor applied to the image size, so OCR boxes can be mapped back.
+
+def grayscale(img):
+    if img.ndim == 3:
+        img = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    return img, 1.0
+
+def clahe(img, clip_limit=2.0, tile_size=8):
+    op = cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=(tile_size, tile_size))
+    if img.ndim == 3:
+        lab = cv2.cvtColor(img, cv2.COLOR_BGR2LAB)
+        lab[:, :, 0] = op.apply(lab[:, :, 0])
+        return cv2.cvtColor(lab, cv2.COLOR_LAB2BGR), 1.0
+    return op.apply(img), 1.0
+
+def adaptive_threshold(img, block_size=31, c=10):
+    if img.ndim == 3:
+        img = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    binary = cv2.adaptiveThreshold(img, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                                   cv2.THRESH_BINARY, block_size, c)
+    return binary, 1.0
+
+def upscale(img, factor=2, interpolation=cv2.INTER_LINEAR):
+    if factor == 1:
+        return img, 1.0
+    return cv2.resize(img, None, fx=factor, fy=factor, interpolation=interpolation), float(factor)
+
+def downscale(img, max_height=360):
+    """Shrink tall ROIs (1440p/4K screens) so OCR cost stays flat"""
+    h = img.shape[0]
+    if h <= max_height:
+        return img, 1.0
+    factor = max_height / h
+    return cv2.resize(img, None, fx=factor, fy=factor, interpolation=cv2.INTER_AREA), factor
+
+_SHARPEN_KERNEL = np.array([[0, -1, 0], [-1, 5, -1], [0, -1, 0]], dtype=np.float32)
+
+def sharpen(img):
+    return cv2.filter2D(img, -1, _SHARPEN_KERNEL), 1.0
+
+STEPS = {
+    "grayscale": grayscale,
+    "clahe": clahe,
+    "adaptive_threshold": adaptive_threshold,
+    "upscale": upscale,
+    "downscale": downscale,
+    "sharpen": sharpen,
+}
+
+PROFILES = {
+    # The original pipeline: colour ROI, bilinear 2x upscale
+    "baseline": [
+        ("upscale", {"factor": 2}),
+    ],
+    "fast": [
+        ("grayscale", {}),
+        ("downscale", {"max_height": 360}),
+    ],
+    "balanced": [
+        ("grayscale", {}),
+        ("upscale", {"factor": 2}),
+    ],
+    "accurate": [
+        ("grayscale", {}),
+        ("clahe", {"clip_limit": 2.0}),
+        ("upscale", {"factor": 2, "interpolation": cv2.INTER_CUBIC}),
+        ("sharpen", {}),
+    ],
+    "binary": [
+        ("grayscale", {}),
+        ("upscale", {"factor": 2}),
+        ("adaptive_threshold", {"block_size": 31, "c": 10}),
+    ],
+}
+
+# Other profiles are opt-in until benchmarks/preprocess_profiles.py shows
+# one keeping the baseline's recall on a labelled corpus
+DEFAULT_PROFILE = "baseline"
+
+class Preprocessor:
+    __slots__ = ('name', 'steps')
+
+    def __init__(self, profile=DEFAULT_PROFILE):
+        if isinstance(profile, str):
+            if profile not in PROFILES:
+                print(f"Unknown preprocessing profile '{profile}', using '{DEFAULT_PROFILE}'")
+                profile = DEFAULT_PROFILE
+            self.name = profile
+            steps = PROFILES[profile]
+        else:
+            self.name = "custom"
+            steps = profile
+        self.steps = [(STEPS[name], kwargs) for name, kwargs in steps]
+
+    def apply(self, img):
+        """Run all steps, returning the processed image and its total scale"""
+        scale = 1.0
+        for step, kwargs in self.steps:
+            img, factor = step(img, **kwargs)
+            scale *= factor
+        return img, scale
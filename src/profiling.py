@@ -0,0 +1,80 @@
+import cProfile
+import io
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from pathlib import Path
+
+PROFILE_DIR = Path(__file__).parent.parent / "profiles"
+
+class ProfileSession:
+    """cProfile + tracemalloc around named phases, one report per phase.
+
+    Startup phases are wrapped explicitly; scan_phase() profiles the next
+    `scans` scans and then turns into a no-op. Reports land in
+    profiles/<timestamp>/ as <phase>.pstats plus a readable <phase>.txt.
+    """
+    __slots__ = ('directory', 'scans_left', '_scan_count', 'top')
+
+    def __init__(self, scans=5, root=PROFILE_DIR, top=30):
+        self.directory = Path(root) / datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.scans_left = scans
+        self._scan_count = 0
+        self.top = top
+        print(f"Profiling startup and the next {scans} scans into {self.directory}")
+
+    def scan_phase(self):
+        if self.scans_left <= 0:
+            return nullcontext()
+        self.scans_left -= 1
+        self._scan_count += 1
+        if self.scans_left == 0:
+            print(f"Profiling the last scan, reports in {self.directory}")
+        return self.phase(f"scan_{self._scan_count:02d}")
+
+    @contextmanager
+    def phase(self, name):
+        tracemalloc.start(10)
+        profiler = cProfile.Profile()
+        wall_start = time.perf_counter()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            wall_ms = (time.perf_counter() - wall_start) * 1000
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            self._write_report(name, profiler, snapshot, wall_ms, current, peak)
+
+    def _write_report(self, name, profiler, snapshot, wall_ms, current, peak):
+        import pstats  # only needed in profile mode; keeps it off normal startup
+
+        profiler.dump_stats(str(self.directory / f"{name}.pstats"))
+
+        out = io.StringIO()
+        out.write(f"Phase: {name}\n")
+        out.write(f"Wall time: {wall_ms:.1f} ms\n")
+        out.write(f"Python allocations: {current / 1024:.1f} KB live, {peak / 1024:.1f} KB peak\n\n")
+
+        stats = pstats.Stats(profiler, stream=out)
+        stats.strip_dirs()
+        out.write("=== Top functions by cumulative time ===\n")
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+        out.write("=== Top functions by own time ===\n")
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(self.top)
+
+        out.write("=== Top allocations (live at end of phase) ===\n")
+        for stat in snapshot.statistics("lineno")[:self.top]:
+            out.write(f"{stat}\n")
+
+        with open(self.directory / f"{name}.txt", 'w', encoding='utf-8') as f:
+            f.write(out.getvalue())
+        print(f"Profiled '{name}': {wall_ms:.0f} ms, peak {peak / (1024 * 1024):.1f} MB")
+
+def phase_or_null(session, name):
+    """session.phase(name), or a free no-op context when profiling is off"""
+    return session.phase(name) if session else nullcontext()
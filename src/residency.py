@@ -0,0 +1,137 @@
+import os
+import sys
+import time
+
+# How the OCR model is kept between scans
+POLICIES = {
+    "resident": "Keep loaded",
+    "idle_unload": "Unload when idle",
+    "subprocess": "Subprocess, killed when idle",
+}
+DEFAULT_POLICY = "resident"
+
+def _windows_memory_counters(pid=None):
+    """PROCESS_MEMORY_COUNTERS of this process (or `pid`), or None"""
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        kernel32 = ctypes.windll.kernel32
+        if pid is None:
+            handle = kernel32.GetCurrentProcess()
+        else:
+            # PROCESS_QUERY_LIMITED_INFORMATION | PROCESS_VM_READ
+            handle = kernel32.OpenProcess(0x1000 | 0x0010, False, pid)
+            if not handle:
+                return None
+        try:
+            if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+                return counters
+        finally:
+            if pid is not None:
+                kernel32.CloseHandle(handle)
+    except Exception:
+        pass
+    return None
+
+def current_rss_mb(pid=None):
+    """Resident set size of this process (or `pid`) in MB, or None if unavailable"""
+    if sys.platform == "win32":
+        counters = _windows_memory_counters(pid)
+        return counters.WorkingSetSize / (1024 * 1024) if counters else None
+
+    try:
+        with open(f"/proc/{pid or 'self'}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return None
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None if unavailable"""
+    if sys.platform == "win32":
+        counters = _windows_memory_counters()
+        return counters.PeakWorkingSetSize / (1024 * 1024) if counters else None
+
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KB, macOS reports bytes
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except Exception:
+        return None
+
+def model_rss_mb(scanner):
+    """Memory of the OCR model's child process when it runs in one, else None"""
+    pid = getattr(scanner.engine, "pid", None)
+    return current_rss_mb(pid) if pid else None
+
+class ModelResidency:
+    """Applies the OCR model memory policy to a ScreenScanner.
+
+    "resident" never unloads. "idle_unload" drops the model after
+    `idle_minutes` without a scan; "subprocess" does the same but the model
+    lives in a child process (engine option isolated=True), so unloading
+    returns all of its memory to the OS. Weights stay in the OCR library's
+    on-disk model cache either way, and warm_up() reloads off the UI
+    thread, typically when the user reaches for the overlay.
+
+    check() is meant to be polled from the UI thread, the same thread that
+    runs scans, so an unload never races a scan in progress.
+    """
+    __slots__ = ('scanner', 'policy', 'idle_minutes', 'unloads', 'last_freed_mb')
+
+    def __init__(self, scanner, policy=DEFAULT_POLICY, idle_minutes=10):
+        self.scanner = scanner
+        self.policy = policy if policy in POLICIES else DEFAULT_POLICY
+        self.idle_minutes = idle_minutes
+        self.unloads = 0
+        self.last_freed_mb = None
+
+    def check(self):
+        """Unload the model if the policy allows and it has been idle long enough"""
+        if self.policy == "resident" or not self.scanner.engine.loaded:
+            return False
+        if time.monotonic() - self.scanner.last_used < self.idle_minutes * 60:
+            return False
+
+        before = current_rss_mb()
+        if not self.scanner.unload():
+            return False
+        after = current_rss_mb()
+        self.unloads += 1
+        self.last_freed_mb = before - after if before is not None and after is not None else None
+        freed = f", freed {self.last_freed_mb:.0f} MB" if self.last_freed_mb is not None else ""
+        print(f"OCR model unloaded after {self.idle_minutes} idle minutes{freed}")
+        return True
+
+    def warm_up(self):
+        self.scanner.warm_up_async()
+
+    def report(self):
+        rss = current_rss_mb()
+        child = model_rss_mb(self.scanner)
+        return {
+            "policy": self.policy,
+            "loaded": self.scanner.engine.loaded,
+            "rss_mb": round(rss, 1) if rss is not None else None,
+            "model_process_mb": round(child, 1) if child is not None else None,
+            "last_load_ms": round(self.scanner.last_load_ms, 1) if self.scanner.last_load_ms else None,
+            "unloads": self.unloads,
+            "last_freed_mb": round(self.last_freed_mb, 1) if self.last_freed_mb is not None else None,
+        }
@@ -0,0 +1,120 @@
+MESSAGE_ROW = "message"
+
+def rarity_style(min_rarity):
+    if min_rarity >= 5:
+        return "gold"  # 5* guaranteed
+    if min_rarity >= 4:
+        return "purple"  # 4* guaranteed
+    return "normal"
+
+def row_values(result):
+    return (", ".join(result['tags']), f"{result['min']}*", f"{result['max']}*")
+
+class ResultsView:
+    """Keeps the results Treeview in step with a list of calculator results.
+
+    Rows are keyed by their tag combination. render() diffs the new results
+    against the rows already in the tree and only inserts, updates, moves
+    or deletes what changed; rows hidden by the rarity filter are detached,
+    not deleted, so set_filter() just re-attaches or detaches them without
+    touching the calculator.
+    """
+    __slots__ = ('tree', 'min_rarity', '_rows', '_results', '_order', '_attached', '_next_id', '_message')
+
+    def __init__(self, tree, min_rarity=3):
+        self.tree = tree
+        self.min_rarity = min_rarity
+        self._rows = {}       # tag tuple -> iid
+        self._results = {}    # iid -> result
+        self._order = []      # iids in result order
+        self._attached = []   # iids currently in the tree, top to bottom
+        self._next_id = 0
+        self._message = None
+
+        tree.tag_configure("gold", foreground="#FFD700", font=('Segoe UI', 10, 'bold'))
+        tree.tag_configure("purple", foreground="#DDA0DD")
+        tree.tag_configure("normal", foreground="#eee")
+
+    @property
+    def visible_count(self):
+        return len(self._attached)
+
+    def result_for(self, iid):
+        """The result behind a row, or None for the message row"""
+        return self._results.get(iid)
+
+    def render(self, results, min_rarity=None):
+        """Show `results` (calculator order); returns the number of visible rows"""
+        if min_rarity is not None:
+            self.min_rarity = min_rarity
+
+        stale = dict(self._rows)
+        order = []
+        for res in results:
+            key = tuple(res['tags'])
+            iid = stale.pop(key, None)
+            if iid is None:
+                iid = f"r{self._next_id}"
+                self._next_id += 1
+                self._rows[key] = iid
+                # Inserted detached; _sync_visible attaches it in place
+                self.tree.insert("", "end", iid=iid, values=row_values(res), tags=(rarity_style(res['min']),))
+                self.tree.detach(iid)
+            elif self._results[iid] is not res and row_values(self._results[iid]) != row_values(res):
+                self.tree.item(iid, values=row_values(res), tags=(rarity_style(res['min']),))
+            self._results[iid] = res
+            order.append(iid)
+
+        if stale:
+            gone = set(stale.values())
+            self._attached = [iid for iid in self._attached if iid not in gone]
+            for key, iid in stale.items():
+                del self._rows[key]
+                del self._results[iid]
+            self.tree.delete(*gone)
+
+        self._order = order
+        return self._sync_visible()
+
+    def set_filter(self, min_rarity):
+        self.min_rarity = min_rarity
+        return self._sync_visible()
+
+    def clear(self):
+        self.render([])
+
+    def show_message(self, text):
+        """Show a single placeholder row while there are no visible results"""
+        if self._message is None:
+            self.tree.insert("", 0, iid=MESSAGE_ROW, values=(text, "-", "-"))
+        elif self._message != text:
+            self.tree.item(MESSAGE_ROW, values=(text, "-", "-"))
+        self._message = text
+
+    def _hide_message(self):
+        if self._message is not None:
+            self.tree.delete(MESSAGE_ROW)
+            self._message = None
+
+    def _sync_visible(self):
+        wanted = [iid for iid in self._order if self._results[iid]['min'] >= self.min_rarity]
+        wanted_set = set(wanted)
+
+        for iid in self._attached:
+            if iid not in wanted_set:
+                self.tree.detach(iid)
+        attached = [iid for iid in self._attached if iid in wanted_set]
+
+        # Move only the rows that aren't already at their index
+        for index, iid in enumerate(wanted):
+            if index < len(attached) and attached[index] == iid:
+                continue
+            if iid in attached:
+                attached.remove(iid)
+            attached.insert(index, iid)
+            self.tree.move(iid, "", index)
+
+        self._attached = attached
+        if attached:
+            self._hide_message()
+        return len(attached)
@@ -1,121 +1,302 @@
+import gc
+import threading
+import time
 import cv2
 import numpy as np
 from PIL import ImageGrab
-from .config import VALID_TAGS
+from .matcher import match_regions, normalize
+from .corrections import CorrectionCache, is_tag_name
+from .fingerprint import fingerprint, thumbnail, ScanCache
+from .metrics import METRICS
+from .preprocess import Preprocessor, DEFAULT_PROFILE
+from .engines import create_engine, EasyOCREngine, DEFAULT_ENGINE
 
-# Build lookup sets for fast exact matching
-_VALID_TAGS_LOWER = {t.lower(): t for t in VALID_TAGS}
-_SHORT_TAGS = {t.lower(): t for t in VALID_TAGS if len(t) <= 4}  # AoE, DPS, Tank, Slow
+def _lap(timings, stage, start):
+    now = time.perf_counter()
+    timings[stage] = (now - start) * 1000
+    return now
 
-# Try rapidfuzz first (faster), fall back to fuzzywuzzy
-try:
-    from rapidfuzz import process, fuzz
-    def fuzzy_match(text, choices, score_cutoff=70):
-        text_lower = text.lower()
-        # Exact match first (handles short tags like AoE, DPS)
-        if text_lower in _VALID_TAGS_LOWER:
-            return _VALID_TAGS_LOWER[text_lower], 100
-        # Fuzzy match for longer text
-        result = process.extractOne(text_lower, choices, scorer=fuzz.ratio, score_cutoff=score_cutoff)
-        if result:
-            return result[0], result[1]
-        return None, 0
-except ImportError:
-    from fuzzywuzzy import process as fuzz_process
-    def fuzzy_match(text, choices, score_cutoff=70):
-        text_lower = text.lower()
-        # Exact match first
-        if text_lower in _VALID_TAGS_LOWER:
-            return _VALID_TAGS_LOWER[text_lower], 100
-        # Fuzzy match
-        result = fuzz_process.extractOne(text, choices)
-        if result and result[1] >= score_cutoff:
-            return result[0], result[1]
-        return None, 0
+def _points_to_rect(bbox):
+    pts = np.array(bbox)
+    return (pts[:, 0].min(), pts[:, 1].min(), pts[:, 0].max(), pts[:, 1].max())
 
 class ScreenScanner:
-    __slots__ = ('reader', 'crop_offset', 'scale', '_gpu_available', '_initialized')
+    __slots__ = ('engine', 'engine_options', 'crop_offset', 'scale', 'preprocessor', 'last_timings',
+                 'corrections', 'last_raw', 'scan_cache', 'debug', 'last_used', 'last_load_ms', '_load_lock')
     
-    def __init__(self):
-        self.reader = None
-        self._initialized = False
-        self._gpu_available = None
+    def __init__(self, profile=DEFAULT_PROFILE, engine=DEFAULT_ENGINE, engine_options=None, corrections=None):
+        self.engine_options = dict(engine_options or {})
+        self.engine = create_engine(engine, **self.engine_options)
         self.crop_offset = (0, 0)
         self.scale = 2
+        self.preprocessor = Preprocessor(profile)
+        self.last_timings = {}
+        self.corrections = corrections if corrections is not None else CorrectionCache()
+        self.last_raw = {}
+        self.scan_cache = ScanCache()
+        # DebugRecorder when debugging is on, None otherwise
+        self.debug = None
+        self.last_used = time.monotonic()
+        self.last_load_ms = None
+        # Loads may run on a warm-up thread while the UI thread wants to scan
+        self._load_lock = threading.Lock()
     
-    def _ensure_initialized(self):
-        if self._initialized:
+    def set_profile(self, profile):
+        self.preprocessor = Preprocessor(profile)
+        self.scan_cache.clear()
+    
+    def set_engine(self, name, options=None):
+        options = dict(options or {})
+        if name == self.engine.name and options == self.engine_options:
             return
-        
-        import easyocr
-        print("Initializing EasyOCR...")
-        
-        self._gpu_available = self._check_gpu()
-        self.reader = easyocr.Reader(['en'], gpu=self._gpu_available, verbose=False)
-        self._initialized = True
-        print(f"EasyOCR ready (GPU={self._gpu_available})")
+        with self._load_lock:
+            self.engine.unload()
+            self.engine_options = options
+            self.engine = create_engine(name, **options)
+        self.scan_cache.clear()
+    
+    def warm_up(self):
+        """Load the OCR engine now instead of on the first scan"""
+        self._ensure_initialized()
     
-    def _check_gpu(self):
+    def warm_up_async(self):
+        """Load the OCR engine on a background thread; scans wait for it if they start first"""
+        if self.engine.loaded:
+            return
+        threading.Thread(target=self._warm_up_quietly, name="OCRWarmUp", daemon=True).start()
+    
+    def _warm_up_quietly(self):
         try:
-            import torch
-            return torch.cuda.is_available()
-        except ImportError:
-            return False
-        except Exception:
-            return False
+            self._ensure_initialized()
+        except Exception as e:
+            print(f"OCR warm-up failed: {e}")
+    
+    def unload(self):
+        """Drop the OCR model until the next scan or warm-up"""
+        with self._load_lock:
+            if not self.engine.loaded:
+                return False
+            self.engine.unload()
+        gc.collect()
+        return True
+    
+    def _ensure_initialized(self):
+        if self.engine.loaded:
+            return
+        
+        with self._load_lock:
+            if self.engine.loaded:
+                return
+            start = time.perf_counter()
+            try:
+                self.engine.load()
+            except (ImportError, FileNotFoundError, OSError) as e:
+                if self.engine.name == EasyOCREngine.name:
+                    raise
+                print(f"Could not load {self.engine.name} engine ({e}), falling back to EasyOCR")
+                self.engine = create_engine(EasyOCREngine.name, **self.engine_options)
+                self.engine.load()
+            self.last_load_ms = (time.perf_counter() - start) * 1000
+            # A warm-up counts as use, or the idle policy would unload it right away
+            self.last_used = time.monotonic()
+        METRICS.observe("model_load", self.last_load_ms)
     
     def capture_screen(self):
         screen = ImageGrab.grab()
         return cv2.cvtColor(np.array(screen), cv2.COLOR_RGB2BGR)
+    
+    def roi_rect(self, width, height):
+        """Screen rect (x1, y1, x2, y2) searched for tags on a width x height screen"""
+        # Wide crop to capture all 5 tags (2 rows x 3 columns)
+        return int(width * 0.15), int(height * 0.45), int(width * 0.85), int(height * 0.78)
+    
+    def capture_roi(self, screen_size):
+        """Grab only the tag area. Returns (roi, (x1, y1))."""
+        x1, y1, x2, y2 = self.roi_rect(*screen_size)
+        roi = ImageGrab.grab(bbox=(x1, y1, x2, y2))
+        return cv2.cvtColor(np.array(roi), cv2.COLOR_RGB2BGR), (x1, y1)
 
     def scan_for_tags(self, img):
-        self._ensure_initialized()
-        
+        """OCR the tag area of a full screenshot.
+
+        Per-stage durations (ms) of the last call are left in ``last_timings``.
+        """
+        start = time.perf_counter()
         h, w, _ = img.shape
-        
-        # Wide crop to capture all 5 tags (2 rows x 3 columns)
-        y1, y2 = int(h * 0.45), int(h * 0.78)
-        x1, x2 = int(w * 0.15), int(w * 0.85)
+        x1, y1, x2, y2 = self.roi_rect(w, h)
         roi = img[y1:y2, x1:x2]
+        return self.scan_roi(roi, (x1, y1), {"crop": (time.perf_counter() - start) * 1000})
+    
+    def scan_roi(self, roi, offset, timings=None, on_tag=None):
+        """OCR an already-cropped tag area whose top-left is at `offset` on screen.
 
-        self.crop_offset = (x1, y1)
-
-        roi_resized = cv2.resize(roi, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_LINEAR)
+        With `on_tag`, regions are recognized one at a time and
+        on_tag(tag, screen_bbox) is called as soon as each tag is matched,
+        before the rest of the area has been read.
+        """
+        self._ensure_initialized()
+        timings = timings if timings is not None else {}
+        start = time.perf_counter()
+        x1, y1 = offset
+        self.crop_offset = offset
         
-        # Save debug image
-        cv2.imwrite("debug_roi.png", roi_resized)
+        # Repeat presses on an unchanged screen skip OCR entirely
+        thumb = thumbnail(roi)
+        fp = fingerprint(thumb)
+        cache_key = (self.preprocessor.name, self.engine.name, x1, y1, roi.shape)
+        cached = self.scan_cache.get(cache_key, fp, thumb)
+        start = _lap(timings, "fingerprint", start)
+        if cached is not None:
+            found_tags, self.last_raw = cached
+            self.last_timings = timings
+            self.last_used = time.monotonic()
+            METRICS.record_timings(timings)
+            if self.debug:
+                self.debug.log("unchanged screen, cached tags %s", list(found_tags))
+            return dict(found_tags), None
 
-        results = self.reader.readtext(roi_resized)
+        roi_resized, self.scale = self.preprocessor.apply(roi)
+        start = _lap(timings, "resize", start)
+
+        if on_tag is None:
+            results = self._read_text(roi_resized, timings)
+            start = time.perf_counter()
+            regions, raw_by_text = self._collect_regions(results)
+            matches = match_regions(regions)
+        else:
+            results, regions, raw_by_text, matches = self._read_text_progressive(roi_resized, timings, on_tag)
+            start = time.perf_counter()
         
         found_tags = {}
+        self.last_raw = {}
+        for tag, rect, score, text in matches:
+            found_tags[tag] = self._bbox_to_screen(rect)
+            # Only whole-region matches are worth learning; fragments and
+            # splits would teach aliases that never recur as one region
+            if text in raw_by_text:
+                self.last_raw[tag] = raw_by_text[text]
+        
+        # The progressive path has already timed its incremental matching
+        timings["match"] = timings.get("match", 0.0) + (time.perf_counter() - start) * 1000
+        self.last_timings = timings
+        self.last_used = time.monotonic()
+        METRICS.record_timings(timings)
+        self.scan_cache.put(cache_key, fp, thumb, (dict(found_tags), dict(self.last_raw)))
+        if self.debug:
+            self.debug.record(roi_resized, results, matches, timings)
+            self.debug.log("  tags %s", list(found_tags))
+        return found_tags, None
+    
+    def confirm_tags(self, tags):
+        """Learn the raw OCR strings behind tags the user acted on"""
+        learned = 0
+        for tag in tags:
+            raw = self.last_raw.get(tag)
+            if raw is None:
+                # Combos come back from the calculator lower-cased
+                raw = next((r for t, r in self.last_raw.items() if t.lower() == tag.lower()), None)
+            if raw and self.corrections.learn(raw, tag):
+                print(f"Learned OCR alias '{raw}' -> '{tag}'")
+                learned += 1
+        if learned:
+            self.corrections.save()
+        return learned
+    
+    def correct_tag(self, old, new):
+        """Feed a manual tag edit (add: old=None, remove: new=None) back to OCR corrections.
+
+        Replacing a tag teaches the raw text that was read for it as an
+        alias of the new tag; removing a tag that came from a learned
+        alias forgets that alias. A raw text that is itself a tag name was
+        read correctly, so swapping it only edits this scan's tags.
+        Returns True if the aliases changed.
+        """
+        raw = None
+        if old is not None:
+            key = next((t for t in self.last_raw if t.lower() == old.lower()), None)
+            if key is not None:
+                raw = self.last_raw.pop(key)
+        learnable = bool(raw) and not is_tag_name(raw)
+        
+        changed = False
+        if learnable and new is not None:
+            changed = self.corrections.learn(raw, new)
+            self.last_raw[new] = raw
+        elif learnable and self.corrections.aliases().get(normalize(raw), "").lower() == old.lower():
+            self.corrections.forget(raw)
+            changed = True
+        if changed:
+            self.corrections.save()
+            print(f"OCR correction: '{raw}' -> {repr(new) if new else 'forgotten'}")
         
-        print(f"OCR detected {len(results)} text regions:")
+        # The cached scan of this screen still holds the uncorrected tags
+        self.scan_cache.clear()
+        if self.debug:
+            self.debug.log("  user edit %r -> %r (read as %r)", old, new, raw)
+        return changed
+    
+    def _collect_regions(self, results):
+        """Filter raw OCR results into matcher regions, applying learned corrections"""
+        regions = []
+        raw_by_text = {}
         for bbox, text, confidence in results:
             text_clean = text.strip()
-            print(f"  '{text_clean}' (conf: {confidence:.2f})")
-            
             if confidence < 0.25 or len(text_clean) < 2:
-                print(f"    -> Skipped (low conf or too short)")
                 continue
             
-            match, score = fuzzy_match(text_clean, VALID_TAGS, score_cutoff=70)
-            
-            if match:
-                screen_bbox = self._bbox_to_screen(bbox)
-                found_tags[match] = screen_bbox
-                print(f"    -> Matched: '{match}' (score: {score})")
+            corrected = self.corrections.lookup(text_clean)
+            if corrected:
+                raw_by_text[corrected.lower()] = text_clean
+                text_clean = corrected
             else:
-                print(f"    -> No match")
+                raw_by_text[normalize(text_clean)] = text_clean
+            
+            regions.append((_points_to_rect(bbox), text_clean, confidence))
+        return regions, raw_by_text
+    
+    def _read_text_progressive(self, img, timings, on_tag):
+        start = time.perf_counter()
+        chunks = self.engine.split_regions(self.engine.detect(img))
+        start = _lap(timings, "detect", start)
         
-        print(f"Final tags: {list(found_tags.keys())}")
-        return found_tags, None
+        results, regions, raw_by_text = [], [], {}
+        matches = []
+        emitted = set()
+        match_ms = 0.0
+        for chunk in chunks:
+            chunk_results = self.engine.recognize(img, chunk)
+            match_start = time.perf_counter()
+            chunk_regions, chunk_raw = self._collect_regions(chunk_results)
+            results.extend(chunk_results)
+            if chunk_regions:
+                regions.extend(chunk_regions)
+                raw_by_text.update(chunk_raw)
+                matches = match_regions(regions)
+                for tag, rect, _, _ in matches:
+                    if tag not in emitted:
+                        emitted.add(tag)
+                        on_tag(tag, self._bbox_to_screen(rect))
+            match_ms += (time.perf_counter() - match_start) * 1000
+        
+        timings["recognize"] = (time.perf_counter() - start) * 1000 - match_ms
+        timings["match"] = match_ms
+        return results, regions, raw_by_text, matches
     
-    def _bbox_to_screen(self, bbox):
-        x_offset, y_offset = self.crop_offset
-        pts = np.array(bbox)
-        x_min = int(pts[:, 0].min() / self.scale + x_offset)
-        x_max = int(pts[:, 0].max() / self.scale + x_offset)
-        y_min = int(pts[:, 1].min() / self.scale + y_offset)
-        y_max = int(pts[:, 1].max() / self.scale + y_offset)
+    def _read_text(self, img, timings):
+        start = time.perf_counter()
+        regions = self.engine.detect(img)
+        start = _lap(timings, "detect", start)
         
-        return (x_min, y_min, x_max, y_max)
\ No newline at end of file
+        results = self.engine.recognize(img, regions)
+        _lap(timings, "recognize", start)
+        return results
+    
+    def _bbox_to_screen(self, rect):
+        x_offset, y_offset = self.crop_offset
+        x_min, y_min, x_max, y_max = rect
+        return (
+            int(x_min / self.scale + x_offset),
+            int(y_min / self.scale + y_offset),
+            int(x_max / self.scale + x_offset),
+            int(y_max / self.scale + y_offset),
+        )
@@ -0,0 +1,76 @@
+import threading
+import time
+
+class ScanScheduler:
+    """Coalesces scan requests from hotkeys, the mouse listener and the watcher.
+
+    At most one scan runs at a time and at most one waits behind it; a new
+    request replaces the waiting one, so mashing a hotkey during a scan
+    costs one extra scan, not one per press. The next scan starts no
+    sooner than `cooldown` seconds after the previous one finished.
+
+    `after` is Tk's root.after: actions always run on the UI thread, while
+    submit() and preempt() may be called from any thread.
+    """
+    __slots__ = ('after', 'cooldown', 'coalesced', '_lock', '_pending', '_running',
+                 '_drain_posted', '_ready_at')
+
+    def __init__(self, after, cooldown=0.25):
+        self.after = after
+        self.cooldown = cooldown
+        self.coalesced = 0
+        self._lock = threading.Lock()
+        self._pending = None
+        self._running = False
+        self._drain_posted = False
+        self._ready_at = 0.0
+
+    def submit(self, action, replace=True):
+        """Queue a scan, replacing any scan that hasn't started yet.
+
+        With replace=False (background triggers) the request is dropped
+        instead when a scan is already running or queued.
+        """
+        with self._lock:
+            if not replace and (self._running or self._pending is not None):
+                self.coalesced += 1
+                return
+            if self._pending is not None:
+                self.coalesced += 1
+            self._pending = action
+            self._post_drain()
+
+    def preempt(self, action=None):
+        """Drop the queued scan, if any, and run `action` on the UI thread"""
+        with self._lock:
+            if self._pending is not None:
+                self.coalesced += 1
+                self._pending = None
+        if action is not None:
+            self.after(0, action)
+
+    def _post_drain(self, delay_ms=0):
+        # Caller holds the lock
+        if not self._running and not self._drain_posted and self._pending is not None:
+            self._drain_posted = True
+            self.after(delay_ms, self._drain)
+
+    def _drain(self):
+        with self._lock:
+            self._drain_posted = False
+            if self._running or self._pending is None:
+                return
+            wait = self._ready_at - time.monotonic()
+            if wait > 0:
+                self._post_drain(int(wait * 1000) + 1)
+                return
+            action, self._pending = self._pending, None
+            self._running = True
+
+        try:
+            action()
+        finally:
+            with self._lock:
+                self._running = False
+                self._ready_at = time.monotonic() + self.cooldown
+                self._post_drain(int(self.cooldown * 1000))
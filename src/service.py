@@ -0,0 +1,192 @@
+import base64
+import json
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from .metrics import METRICS
+from .pipeline import RecruitPipeline
+
+class ServiceBusy(Exception):
+    pass
+
+class RecruitService:
+    """Scan and calculate behind a bounded pool of warm pipelines.
+
+    Each worker slot owns one RecruitPipeline (an OCR reader isn't safe to
+    share between threads). Requests borrow a slot for the duration of a
+    scan; at most `max_queue` may wait for one, beyond that they are
+    rejected with ServiceBusy instead of piling up. Tag-only calculations
+    don't need a reader and never wait for a slot.
+    """
+    __slots__ = ('workers', 'max_queue', 'slot_timeout', '_slots', '_calc_pipeline', '_lock',
+                 'waiting', 'in_flight', 'served', 'rejected')
+
+    def __init__(self, pool, workers=1, max_queue=8, slot_timeout=30.0, **scanner_options):
+        self.workers = max(1, workers)
+        self.max_queue = max_queue
+        self.slot_timeout = slot_timeout
+        self._slots = queue.Queue()
+        self._lock = threading.Lock()
+        self.waiting = 0
+        self.in_flight = 0
+        self.served = 0
+        self.rejected = 0
+
+        for _ in range(self.workers):
+            pipeline = RecruitPipeline(pool, **scanner_options)
+            pipeline.warm_up()
+            self._slots.put(pipeline)
+        # The calculator is read-only after construction, so any pipeline's will do
+        self._calc_pipeline = pipeline
+
+    def scan(self, img, sort_mode="min", top=10):
+        with self._lock:
+            if self.waiting >= self.max_queue:
+                self.rejected += 1
+                raise ServiceBusy(f"{self.waiting} requests already waiting")
+            self.waiting += 1
+
+        wait_start = time.perf_counter()
+        try:
+            pipeline = self._slots.get(timeout=self.slot_timeout)
+        except queue.Empty:
+            with self._lock:
+                self.waiting -= 1
+                self.rejected += 1
+            raise ServiceBusy("timed out waiting for a free worker")
+        wait_ms = (time.perf_counter() - wait_start) * 1000
+        METRICS.observe("service_queue_wait", wait_ms)
+
+        with self._lock:
+            self.waiting -= 1
+            self.in_flight += 1
+        try:
+            with METRICS.span("service_scan"):
+                result = pipeline.process(img, sort_mode=sort_mode, top=top)
+            result["timings"]["queue_wait"] = round(wait_ms, 3)
+            return result
+        finally:
+            self._slots.put(pipeline)
+            with self._lock:
+                self.in_flight -= 1
+                self.served += 1
+
+    def calculate(self, tags, sort_mode="min", top=10):
+        with METRICS.span("service_calculate"):
+            result = self._calc_pipeline.calculate(tags, sort_mode=sort_mode, top=top)
+        with self._lock:
+            self.served += 1
+        return result
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "waiting": self.waiting,
+                "in_flight": self.in_flight,
+                "served": self.served,
+                "rejected": self.rejected,
+            }
+
+    def prometheus(self):
+        lines = [METRICS.to_prometheus().rstrip("\n")]
+        for name, value in self.stats().items():
+            kind = "counter" if name in ("served", "rejected") else "gauge"
+            suffix = "_total" if kind == "counter" else ""
+            lines.append(f"# TYPE recruit_service_{name}{suffix} {kind}")
+            lines.append(f"recruit_service_{name}{suffix} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def decode_image(body, content_type):
+    """Raw image bytes, or JSON {"image": "<base64>"}, to a BGR array"""
+    import cv2
+    import numpy as np
+
+    if content_type.startswith("application/json"):
+        body = base64.b64decode(json.loads(body)["image"])
+    img = cv2.imdecode(np.frombuffer(body, np.uint8), cv2.IMREAD_COLOR)
+    if img is None:
+        raise ValueError("could not decode image")
+    return img
+
+class RecruitRequestHandler(BaseHTTPRequestHandler):
+    """JSON API over a RecruitService (set as `server.service`).
+
+    POST /scan       image bytes (or {"image": base64}) -> tags, bboxes, combos
+    POST /calculate  {"tags": [...], "sort": "min", "top": 10} -> combos
+    GET  /health     worker and queue state
+    GET  /metrics    Prometheus text format
+    """
+    server_version = "RecruitService/1.0"
+    max_body = 20 * 1024 * 1024
+
+    def do_GET(self):
+        path, _, _ = self.path.partition("?")
+        if path == "/health":
+            self._send_json(200, {"status": "ok", **self.server.service.stats()})
+        elif path == "/metrics":
+            self._send(200, self.server.service.prometheus().encode(), "text/plain; version=0.0.4")
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        path, _, query = self.path.partition("?")
+        params = dict(p.split("=", 1) for p in query.split("&") if "=" in p)
+        try:
+            body = self._read_body()
+            if path == "/scan":
+                img = decode_image(body, self.headers.get("Content-Type", ""))
+                result = self.server.service.scan(img, sort_mode=params.get("sort", "min"),
+                                                  top=int(params.get("top", 10)))
+            elif path == "/calculate":
+                request = json.loads(body or b"{}")
+                tags = request.get("tags")
+                if not isinstance(tags, list) or not all(isinstance(t, str) for t in tags):
+                    raise ValueError("'tags' must be a list of strings")
+                result = self.server.service.calculate(tags, sort_mode=request.get("sort", "min"),
+                                                       top=int(request.get("top", 10)))
+            else:
+                self._send_json(404, {"error": "not found"})
+                return
+        except ServiceBusy as e:
+            self._send_json(503, {"error": str(e)}, retry_after=1)
+            return
+        except (ValueError, KeyError, TypeError) as e:
+            self._send_json(400, {"error": str(e)})
+            return
+        except Exception as e:
+            self._send_json(500, {"error": f"{type(e).__name__}: {e}"})
+            return
+        self._send_json(200, result)
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > self.max_body:
+            raise ValueError("request body too large")
+        return self.rfile.read(length)
+
+    def _send_json(self, status, payload, retry_after=None):
+        self._send(status, json.dumps(payload).encode(), "application/json", retry_after)
+
+    def _send(self, status, data, content_type, retry_after=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        if retry_after is not None:
+            self.send_header("Retry-After", str(retry_after))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+def create_server(service, host="127.0.0.1", port=8765, verbose=False):
+    server = ThreadingHTTPServer((host, port), RecruitRequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    server.verbose = verbose
+    return server
@@ -18,6 +18,28 @@ DEFAULT_SETTINGS = {
     "features": {
         "auto_click": False,
         "min_rarity": 3
+    },
+    "scanner": {
+        "profile": "baseline",
+        "engine": "easyocr",
+        "threads": 0,
+        "quantize": True,  # EasyOCR's own CPU default, as before the option existed
+        "small_input": False,
+        "cooldown_ms": 250
+    },
+    "watch": {
+        "enabled": False,
+        "fps": 2.0,
+        "cpu_budget": 2.0
+    },
+    "memory": {
+        "policy": "resident",
+        "idle_minutes": 10
+    },
+    "debug": {
+        "enabled": False,
+        "ring_size": 20,
+        "log_max_kb": 1024
     }
 }
 
@@ -98,3 +120,36 @@ class SettingsManager:
     @quick_hotkey.setter
     def quick_hotkey(self, value):
         self.set(value, "hotkeys", "quick")
+    
+    @property
+    def scan_profile(self):
+        return self.get("scanner", "profile") or "baseline"
+    
+    @scan_profile.setter
+    def scan_profile(self, value):
+        self.set(value, "scanner", "profile")
+    
+    @property
+    def ocr_engine(self):
+        return self.get("scanner", "engine") or "easyocr"
+    
+    @ocr_engine.setter
+    def ocr_engine(self, value):
+        self.set(value, "scanner", "engine")
+    
+    @property
+    def engine_options(self):
+        return {
+            "threads": self.get("scanner", "threads") or 0,
+            "quantize": bool(self.get("scanner", "quantize")),
+            "small_input": bool(self.get("scanner", "small_input")),
+            "isolated": self.memory_policy == "subprocess",
+        }
+    
+    @property
+    def memory_policy(self):
+        return self.get("memory", "policy") or "resident"
+    
+    @property
+    def idle_minutes(self):
+        return self.get("memory", "idle_minutes") or 10
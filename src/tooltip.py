@@ -0,0 +1,73 @@
+import tkinter as tk
+
+def operators_text(operators, limit=10):
+    op_lines = []
+    for op in operators[:limit]:
+        rarity = op['rarity']
+        name = op['name']
+        if rarity >= 5:
+            op_lines.append(f"  ⭐ {rarity}★ {name}")
+        elif rarity >= 4:
+            op_lines.append(f"  ✦ {rarity}★ {name}")
+        else:
+            op_lines.append(f"     {rarity}★ {name}")
+
+    if len(operators) > limit:
+        op_lines.append(f"  ... +{len(operators) - limit} more")
+
+    return "OPERATORS\n" + "\n".join(op_lines)
+
+class Tooltip:
+    """One persistent tooltip window; shown, moved and re-labelled in place.
+
+    `key` identifies what the tooltip is showing (the hovered row), so a
+    show() for the same key while visible does nothing at all.
+    """
+    __slots__ = ('root', 'key', '_window', '_label')
+
+    def __init__(self, root):
+        self.root = root
+        self.key = None
+        self._window = None
+        self._label = None
+
+    @property
+    def visible(self):
+        return self.key is not None
+
+    def show(self, key, text, x, y):
+        if key == self.key:
+            return
+        if self._window is None:
+            self._build()
+        self._label.config(text=text)
+        self._window.geometry(f"+{x}+{y}")
+        if self.key is None:
+            self._window.deiconify()
+            self._window.lift()
+        self.key = key
+
+    def hide(self, event=None):
+        if self.key is not None:
+            self._window.withdraw()
+            self.key = None
+
+    def rect(self):
+        """Screen rect of the tooltip as last shown"""
+        win = self._window
+        x, y = win.winfo_rootx(), win.winfo_rooty()
+        return x, y, x + win.winfo_width(), y + win.winfo_height()
+
+    def _build(self):
+        self._window = tk.Toplevel(self.root)
+        self._window.wm_overrideredirect(True)
+        self._window.attributes("-topmost", True)
+        self._window.withdraw()
+
+        frame = tk.Frame(self._window, bg="#0f3460", highlightbackground="#e94560",
+                        highlightthickness=1)
+        frame.pack()
+
+        self._label = tk.Label(frame, bg="#0f3460", fg="#eee",
+                               font=("Segoe UI", 9), justify="left", padx=10, pady=8)
+        self._label.pack()
@@ -0,0 +1,144 @@
+import threading
+import time
+import numpy as np
+from PIL import ImageGrab
+from .capture import mask_rects
+from .fingerprint import fingerprint, hamming, thumbnail, thumbnail_difference
+
+class ScreenWatcher:
+    """Background auto-scan trigger.
+
+    Samples only the tag ROI at a low frame rate and compares a difference
+    hash and a thumbnail of each frame with the previous one (the hash
+    alone can miss a change of tag text). When the ROI changes and then
+    holds still for one frame, `on_change(roi, offset)` is called from the
+    watcher thread with the settled frame. Once a real tag screen has been
+    seen, its colour histogram is remembered and later changes only fire
+    when the frame looks like that screen again, so ordinary gameplay never
+    costs an OCR pass.
+
+    The sampling loop tracks its own CPU time and stretches the interval
+    whenever it would exceed `cpu_budget` (percent of one core).
+    """
+    __slots__ = ('scanner', 'on_change', 'fps', 'cpu_budget', 'mask_provider',
+                 'change_bits', 'settle_bits', 'change_level', 'min_similarity',
+                 '_thread', '_stop', '_screen_size', '_reference_hist',
+                 '_window_start', '_window_cpu', 'idle_cost')
+
+    def __init__(self, scanner, on_change, fps=2.0, cpu_budget=2.0, mask_provider=None):
+        self.scanner = scanner
+        self.on_change = on_change
+        self.fps = fps
+        self.cpu_budget = cpu_budget
+        self.mask_provider = mask_provider
+        # Out of 1024 fingerprint bits
+        self.change_bits = 24
+        self.settle_bits = 8
+        # Largest thumbnail cell difference still counted as the same frame
+        self.change_level = 12.0
+        self.min_similarity = 0.75
+        self._thread = None
+        self._stop = threading.Event()
+        self._screen_size = None
+        self._reference_hist = None
+        self._window_start = 0.0
+        self._window_cpu = 0.0
+        self.idle_cost = 0.0
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="ScreenWatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+        self._thread = None
+
+    def remember_tag_screen(self, roi):
+        """Called after a scan that found tags; future triggers must resemble it"""
+        self._reference_hist = _colour_hist(roi)
+
+    def _run(self):
+        if self._screen_size is None:
+            self._screen_size = ImageGrab.grab().size
+
+        last = None
+        pending = None
+        fired = None
+        self._window_start = time.perf_counter()
+        self._window_cpu = 0.0
+
+        while not self._stop.is_set():
+            cpu_start = time.thread_time()
+            try:
+                roi, offset = self.scanner.capture_roi(self._screen_size)
+                self._apply_mask(roi, offset)
+                thumb = thumbnail(roi)
+                sample = (fingerprint(thumb), thumb)
+            except Exception as e:
+                print(f"Watch sample failed: {e}")
+                sample = None
+
+            if sample is not None:
+                if pending is not None and not self._differs(sample, pending, self.settle_bits):
+                    # Change has settled; fire unless it's the frame we last scanned
+                    pending = None
+                    if (fired is None or self._differs(sample, fired, self.settle_bits)) and self._looks_like_tags(roi):
+                        fired = sample
+                        self.on_change(roi, offset)
+                elif last is None or self._differs(sample, last, self.change_bits):
+                    pending = sample
+                else:
+                    pending = None if pending is None else sample
+                last = sample
+
+            self._stop.wait(self._account(time.thread_time() - cpu_start))
+
+    def _differs(self, a, b, bits):
+        """Compare two (fingerprint, thumbnail) samples"""
+        return hamming(a[0], b[0]) > bits or thumbnail_difference(a[1], b[1]) > self.change_level
+
+    def _looks_like_tags(self, roi):
+        if self._reference_hist is None:
+            return True
+        similarity = np.minimum(self._reference_hist, _colour_hist(roi)).sum()
+        return similarity >= self.min_similarity
+
+    def _apply_mask(self, roi, offset):
+        # Blank our own windows so overlay redraws don't look like screen changes
+        if self.mask_provider:
+            mask_rects(roi, offset, self.mask_provider())
+
+    def _account(self, cpu_used):
+        """Update the idle cost and return how long to sleep before the next sample"""
+        now = time.perf_counter()
+        self._window_cpu += cpu_used
+        elapsed = now - self._window_start
+        if elapsed >= 5.0:
+            self.idle_cost = self._window_cpu / elapsed * 100
+            self._window_start = now
+            self._window_cpu = 0.0
+
+        interval = 1.0 / max(0.1, self.fps)
+        # Never let one sample cost more than the budget allows per interval
+        budget_interval = cpu_used / (self.cpu_budget / 100) if self.cpu_budget > 0 else 0.0
+        return max(0.0, max(interval, budget_interval) - cpu_used)
+
+
+def _colour_hist(img, bins=4):
+    """Normalised bins^3 colour histogram from a sparse pixel sample"""
+    h, w = img.shape[:2]
+    ys = np.linspace(0, h - 1, 64).astype(np.intp)
+    xs = np.linspace(0, w - 1, 128).astype(np.intp)
+    sample = img[ys[:, None], xs[None, :], :3].reshape(-1, 3) // (256 // bins)
+    index = (sample[:, 0].astype(np.intp) * bins + sample[:, 1]) * bins + sample[:, 2]
+    hist = np.bincount(index, minlength=bins ** 3).astype(np.float32)
+    return hist / hist.sum()